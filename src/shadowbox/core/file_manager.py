@@ -6,7 +6,7 @@ import uuid
 from pathlib import Path
 import json
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from ..database.connection import DatabaseConnection
 from ..database.models import UserModel, FileModel, BoxModel, BoxShareModel
 from .models import FileMetadata, FileStatus, UserDirectory, Box, BoxShare
@@ -298,10 +298,7 @@ class FileManager:
             raise UserNotFoundError(f"User with ID '{user_id}' not found.")
         return self.file_model.list_by_user(user_id)
 
-    def list_box_files(
-        self, box_id: str, user_id: Optional[str] = None
-    ) -> List[FileMetadata]:
-        """List all files in a box."""
+    def _check_box_read(self, box_id: str, user_id: Optional[str]) -> None:
         box = self.get_box(box_id)
         if not box:
             raise BoxNotFoundError(f"Box with ID '{box_id}' not found.")
@@ -313,8 +310,25 @@ class FileManager:
                     f"User '{user_id}' does not have read access to box '{box_id}'."
                 )
 
+    def list_box_files(
+        self, box_id: str, user_id: Optional[str] = None
+    ) -> List[FileMetadata]:
+        """List all files in a box."""
+        self._check_box_read(box_id, user_id)
         return self.file_model.list_by_box(box_id)
 
+    def list_box_files_columns(
+        self, box_id: str, user_id: Optional[str] = None
+    ) -> Dict[str, list]:
+        """List the files in a box as parallel column lists.
+
+        Returns a dict with ``file_id``, ``filename``, ``size``, ``tags``,
+        ``status`` and ``modified_at`` lists (raw DB values), for callers
+        that only display a listing and do not need FileMetadata objects.
+        """
+        self._check_box_read(box_id, user_id)
+        return self.file_model.list_columns_by_box(box_id)
+
     def share_box(
         self,
         box_id: str,
@@ -3,6 +3,7 @@
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 import json
+import uuid
 from .connection import DatabaseConnection
 from ..core.models import FileMetadata, FileType, FileStatus, Box, BoxShare
 from ..core.exceptions import StorageError
@@ -49,6 +50,23 @@ class UserModel(BaseModel):
         query = "SELECT * FROM users WHERE username = ?"
         return self.db.fetch_one(query, (username,))
 
+    def ensure_usernames(self, usernames, quota_bytes=10737418240):
+        """Create any missing users and return a username -> user_id map."""
+        usernames = list(dict.fromkeys(usernames))
+        if not usernames:
+            return {}
+        placeholders = ",".join(["?"] * len(usernames))
+        with self.db.get_transaction_context() as cursor:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO users (user_id, username, quota_bytes) VALUES (?, ?, ?)",
+                [(str(uuid.uuid4()), name, quota_bytes) for name in usernames],
+            )
+            cursor.execute(
+                f"SELECT user_id, username FROM users WHERE username IN ({placeholders})",
+                usernames,
+            )
+            return {row["username"]: row["user_id"] for row in cursor.fetchall()}
+
     def update_quota(self, user_id, used_bytes):
         """Update a user's used_bytes quota value."""
         query = "UPDATE users SET used_bytes = ? WHERE user_id = ?"
@@ -187,6 +205,36 @@ class BoxShareModel(BaseModel):
         self.db.execute(query, params)
         return self.get(share.share_id)
 
+    def replace_many(self, shares):
+        """Replace each (box, user) share with the given ones in one transaction."""
+        delete_query = "DELETE FROM box_shares WHERE box_id = ? AND shared_with_user_id = ?"
+        insert_query = """
+            INSERT INTO box_shares (share_id, box_id, shared_by_user_id, shared_with_user_id,
+                                  permission_level, expires_at, access_token)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+
+        with self.db.get_transaction_context() as cursor:
+            cursor.executemany(
+                delete_query, [(s.box_id, s.shared_with_user_id) for s in shares]
+            )
+            cursor.executemany(
+                insert_query,
+                [
+                    (
+                        s.share_id,
+                        s.box_id,
+                        s.shared_by_user_id,
+                        s.shared_with_user_id,
+                        s.permission_level,
+                        s.expires_at,
+                        s.access_token,
+                    )
+                    for s in shares
+                ],
+            )
+        return True
+
     def update(self, share):
         """
         Update box share
@@ -492,6 +540,43 @@ class FileModel(BaseModel):
 
         return result
 
+    def list_columns_by_box(self, box_id, include_deleted=False):
+        """List files in a box as column lists for display.
+
+        Skips building FileMetadata objects and fetches all tags in a single
+        query instead of one per file.
+        """
+        query = """
+            SELECT file_id, filename, size, status, modified_at
+            FROM files WHERE box_id = ?
+        """
+        if not include_deleted:
+            query += " AND status != 'deleted'"
+        query += " ORDER BY created_at DESC"
+        rows = self.db.fetch_all(query, (box_id,))
+
+        tag_rows = self.db.fetch_all(
+            """
+            SELECT t.entity_id, t.tag_name FROM tags t
+            JOIN files f ON f.file_id = t.entity_id
+            WHERE t.entity_type = 'file' AND f.box_id = ?
+            """,
+            (box_id,),
+        )
+        tags = {}
+        for row in tag_rows:
+            tags.setdefault(row["entity_id"], []).append(row["tag_name"])
+
+        file_ids = [row["file_id"] for row in rows]
+        return {
+            "file_id": file_ids,
+            "filename": [row["filename"] for row in rows],
+            "size": [row["size"] for row in rows],
+            "tags": [tags.get(file_id, []) for file_id in file_ids],
+            "status": [row["status"] for row in rows],
+            "modified_at": [row["modified_at"] for row in rows],
+        }
+
     def list_by_user_and_box(self, user_id, box_id, include_deleted=False):
         """List files for a user in a specific box."""
         query = "SELECT * FROM files WHERE user_id = ? AND box_id = ?"
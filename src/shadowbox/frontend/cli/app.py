@@ -5,14 +5,24 @@ Start here with `python -m shadowbox.frontend.cli.app`
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import json
+import os
+import re
 import threading
+import time
+from collections import defaultdict
+from contextlib import aclosing, suppress
 from datetime import datetime, timedelta
-from typing import Iterable, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncIterator, Callable, NamedTuple, Optional, TypeVar
 
 from textual import on
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical
 from textual.screen import ModalScreen
+from textual.timer import Timer
 from textual.widgets import (
     Button,
     Checkbox,
@@ -26,48 +36,210 @@ from textual.widgets import (
     Static,
     Tree,
 )
-
-from shadowbox.core.models import BoxShare, FileMetadata
-from shadowbox.database.models import BoxModel, BoxShareModel
-from shadowbox.database.models import row_to_metadata
-from shadowbox.database.search import fuzzy_search_fts, search_by_tag, tags_map
-from shadowbox.frontend.cli.clipboard import copy_to_clipboard
-from shadowbox.frontend.cli.context import AppContext, build_context
-from shadowbox.network.adapter import init_env, select_box
-from shadowbox.network.client import (
-    cmd_delete,
-    cmd_put,
-    connect_and_request,
-    get_server_address,
-)
-from shadowbox.network.server import (
-    advertise_service,
-    give_code,
-    start_tcp_server,
-    stop_server,
-)
+from textual.widgets.tree import TreeNode
+from textual.worker import get_current_worker
+
+from shadowbox.core.models import Box, BoxShare
+from shadowbox.database.models import BoxModel, BoxShareModel, UserModel, row_to_metadata
+from shadowbox.frontend.cli.fuzzy import FuzzyIndex
+
+if TYPE_CHECKING:
+    from shadowbox.frontend.cli.context import AppContext
+
+# shadowbox.network (zeroconf, sockets), the clipboard helper and
+# build_context (FileManager, storage, security backends) are imported inside
+# the code that uses them to keep startup imports small.
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Files table rows are materialized in pages as the user scrolls; a new page
+# is added once the viewport comes within this many rows of the end.
+_TABLE_BUFFER = 20
+
+# Remote box listings are reused for this many seconds before re-fetching.
+_REMOTE_LIST_TTL = 5.0
+
+# The user's quota row is re-read at least this often (seconds), so usage
+# changed by peers writing into shared boxes reaches the status line.
+_USER_ROW_TTL = 30.0
+
+# Streamed remote listings are added to the table in batches of this size.
+_REMOTE_BATCH = 100
+
+# Upper bound on concurrent transfers when uploading a folder to a remote box.
+_REMOTE_TRANSFER_WORKERS = 8
+
+# Connected boxes heard from within this many seconds are not re-probed.
+_LIVENESS_IDLE = 30.0
+
+# Consecutive failed liveness probes before a connected box is dropped.
+_LIVENESS_STRIKES = 3
+
+# Minimum seconds between liveness probe rounds, however they are triggered.
+_LIVENESS_DEBOUNCE = 5.0
+
+# Liveness probes in flight at once, and how long each may take (seconds).
+_LIVENESS_MAX_PROBES = 64
+_LIVENESS_PROBE_TIMEOUT = 2.0
+
+# Dropped connections reported within this many seconds share one toast.
+_DROP_NOTICE_DELAY = 0.2
+
+# Share TTL renewal period; share rows expire 10s after the last renewal.
+_SHARE_RENEW_EVERY = 3.0
+
+# mDNS service type advertised by public (code-less) shares.
+_PUBLIC_SERVICE_TYPE = "_shadowbox._tcp.local."
+
+# Patterns for the text LIST format (servers without LIST JSON).
+_RE_ENTRY = re.compile(r"^([^:]+):\s*\{(.+)\}$")
+_RE_FN = re.compile(r"Filename:\s*([^,]+?)(?:,|$)")
+_RE_TAGS = re.compile(r"Tags:\s*\[([^\]]*)\]")
+_RE_TAG = re.compile(r"'([^']*)'")
+_RE_STATUS = re.compile(r"Status:\s*(\w+)")
+_RE_MOD = re.compile(r"Modified:\s*([^,}]+)")
+# Case-insensitive error marker in server replies (no uppercased copy).
+_RE_ERROR = re.compile(r"ERROR", re.IGNORECASE)
+
+# Tag search over owned and shared boxes. Kept as fixed strings so sqlite3's
+# per-connection statement cache reuses the prepared statement across calls.
+# Each file's tags come back joined by _TAG_SEP in the same query.
+_TAG_SEP = "\x1f"
+_TAG_SQL = """
+    SELECT DISTINCT f.*,
+        (SELECT GROUP_CONCAT(t2.tag_name, char(31)) FROM tags t2
+         WHERE t2.entity_type = 'file' AND t2.entity_id = f.file_id) AS all_tags
+    FROM files f
+    JOIN tags t ON t.entity_type = 'file' AND t.entity_id = f.file_id
+    JOIN boxes b ON f.box_id = b.box_id
+    LEFT JOIN box_shares bs
+        ON bs.box_id = b.box_id
+        AND bs.shared_with_user_id = ?
+    WHERE t.tag_name = ?
+      AND f.status != 'deleted'
+      AND (
+          b.user_id = ?
+          OR (
+              bs.share_id IS NOT NULL
+              AND (bs.expires_at IS NULL OR bs.expires_at > CURRENT_TIMESTAMP)
+          )
+      )
+"""
+_TAG_SQL_ALL = _TAG_SQL + " ORDER BY f.created_at DESC LIMIT ?"
+_TAG_SQL_BOX = _TAG_SQL + " AND f.box_id = ? ORDER BY f.created_at DESC LIMIT ?"
 
 
+@lru_cache(maxsize=4096)
 def _human_size(num: int) -> str:
-    # Simple human-readable bytes formatter.
-    for unit in ("B", "KB", "MB", "GB", "TB"):
-        if num < 1024:
-            return f"{num:.1f} {unit}" if unit != "B" else f"{num} B"
-        num /= 1024
-    return f"{num:.1f} PB"
+    # Simple human-readable bytes formatter; 1024 == 2**10 so the unit
+    # index falls out of the bit length.
+    if num < 1024:
+        return f"{num} B"
+    i = min((int(num).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{num / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
+
+
+def _fmt_modified(value) -> str:
+    # DB rows hold ISO strings; show them to the second like datetimes.
+    if isinstance(value, str):
+        # Naive "YYYY-MM-DD HH:MM:SS[.ffffff]" is the common shape: slice it
+        # instead of parsing into a datetime and formatting it back.
+        if (
+            len(value) in (19, 26)
+            and value[10] in " T"
+            and value[4] == "-"
+            and value[13] == ":"
+        ):
+            return f"{value[:10]}T{value[11:19]}"
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="seconds")
+    return str(value)
+
+
+class _DialogButtons(Horizontal):
+    """Cancel/confirm button row shared by the modal dialogs.
+
+    Pass ``cancel_label=None`` for a single-button row.
+    """
+
+    def __init__(
+        self,
+        ok_label: str,
+        *,
+        ok_id: str = "ok",
+        ok_variant: str = "primary",
+        cancel_label: Optional[str] = "Cancel (Esc)",
+        cancel_id: str = "cancel",
+    ):
+        super().__init__()
+        self._ok = (ok_label, ok_id, ok_variant)
+        self._cancel = (cancel_label, cancel_id)
+
+    def compose(self) -> ComposeResult:
+        cancel_label, cancel_id = self._cancel
+        if cancel_label is not None:
+            yield Button(cancel_label, id=cancel_id)
+        ok_label, ok_id, ok_variant = self._ok
+        yield Button(ok_label, id=ok_id, variant=ok_variant)
+
+
+_T = TypeVar("_T")
+_M = TypeVar("_M", bound=ModalScreen)
+
+
+class _KeyDismissModal(ModalScreen[_T]):
+    """Modal that submits on Enter and cancels on Escape.
+
+    Subclasses override ``_submit`` to dismiss with their result. Buttons listed in ``CANCEL_IDS``
+    cancel, any other button submits. Cancelling dismisses with
+    ``CANCEL_RESULT``. Subclasses with extra buttons override ``_press``
+    rather than ``on_button_pressed``, which Textual would run as well.
+    """
+
+    CANCEL_IDS: tuple[str, ...] = ("cancel",)
+    CANCEL_RESULT = None
+
+    def _submit(self) -> None:
+        """Build the result and dismiss; by default just closes with None."""
+        self.dismiss(None)
+
+    def _cancel(self) -> None:
+        self.dismiss(self.CANCEL_RESULT)
+
+    def _press(self, button_id: Optional[str]) -> None:
+        if button_id in self.CANCEL_IDS:
+            self._cancel()
+        else:
+            self._submit()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        self._press(event.button.id)
+
+    def on_key(self, event) -> None:  # pragma: no cover
+        if event.key == "escape":
+            self._cancel()
+        elif event.key == "enter":
+            self._submit()
 
 
 # === Modal definitions ===
 
 
 class AddFileResult:
+    __slots__ = ("path", "tags", "encrypt")
+
     def __init__(self, path: str, tags: list[str], encrypt: bool):
         self.path = path
         self.tags = tags
         self.encrypt = encrypt
 
 
-class AddFileModal(ModalScreen[Optional[AddFileResult]]):
+class AddFileModal(_KeyDismissModal[Optional[AddFileResult]]):
     def __init__(self, encrypt_ready: bool = False):
         super().__init__()
         self.encrypt_ready = encrypt_ready
@@ -88,82 +260,60 @@ class AddFileModal(ModalScreen[Optional[AddFileResult]]):
             )
             self.encrypt_box = Checkbox(encrypt_label, disabled=not self.encrypt_ready)
             yield self.encrypt_box
-            with Horizontal():
-                yield Button("Cancel (Esc)", id="cancel")
-                yield Button("Add (Enter)", id="ok", variant="primary")
+            yield _DialogButtons("Add (Enter)")
 
     def on_mount(self) -> None:  # pragma: no cover
         self.set_focus(self.path_input)
 
-    def on_button_pressed(
-        self, event: Button.Pressed
-    ) -> None:  # pragma: no cover - UI only
-        if event.button.id == "cancel":
-            self.dismiss(None)
-            return
+    def _submit(self) -> None:
         path = self.path_input.value.strip()
         tags = [t.strip() for t in self.tags_input.value.split(",") if t.strip()]
         self.dismiss(
             AddFileResult(path=path, tags=tags, encrypt=self.encrypt_box.value)
         )
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            # trigger primary action
-            path = self.path_input.value.strip()
-            tags = [t.strip() for t in self.tags_input.value.split(",") if t.strip()]
-            self.dismiss(
-                AddFileResult(path=path, tags=tags, encrypt=self.encrypt_box.value)
-            )
-
 
 class DownloadResult:
+    __slots__ = ("dest",)
+
     def __init__(self, dest: str):
         self.dest = dest
 
 
-class DownloadModal(ModalScreen[Optional[DownloadResult]]):
+class DownloadModal(_KeyDismissModal[Optional[DownloadResult]]):
     def compose(self) -> ComposeResult:  # pragma: no cover
         with Vertical(classes="dialog"):
             yield Static("Download File", classes="title")
             yield Label("Save to path (Enter to save, Esc to cancel)")
             self.dest_input = Input(placeholder="/tmp/output")
             yield self.dest_input
-            with Horizontal():
-                yield Button("Cancel (Esc)", id="cancel")
-                yield Button("Save (Enter)", id="ok", variant="primary")
+            yield _DialogButtons("Save (Enter)")
 
-    def on_mount(self) -> None:  # pragma: no cover
+    def on_screen_resume(self) -> None:  # pragma: no cover
+        # The app reuses one instance (see ShadowBoxApp._modal).
+        self.dest_input.value = ""
         self.set_focus(self.dest_input)
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        if event.button.id == "cancel":
-            self.dismiss(None)
-            return
+    def _submit(self) -> None:
         dest = self.dest_input.value.strip()
         self.dismiss(DownloadResult(dest=dest))
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            dest = self.dest_input.value.strip()
-            self.dismiss(DownloadResult(dest=dest))
-
 
 class InitialSetupResult:
     """Initial setup result - first box name and optional master key."""
 
+    __slots__ = ("box_name", "master_key")
+
     def __init__(self, box_name: str, master_key: str | None):
         self.box_name = box_name
         self.master_key = master_key
 
 
-class InitialSetupModal(ModalScreen[Optional[InitialSetupResult]]):
+class InitialSetupModal(_KeyDismissModal[Optional[InitialSetupResult]]):
     """First-run setup modal to configure initial box and master key."""
 
+    CANCEL_IDS = ("skip",)
+
     def compose(self) -> ComposeResult:  # pragma: no cover - UI only
         with Vertical(classes="dialog"):
             yield Static("Initial Setup", classes="title")
@@ -175,9 +325,7 @@ class InitialSetupModal(ModalScreen[Optional[InitialSetupResult]]):
             yield Label("Master key (optional - blank disables encryption)")
             self.master_input = Input(placeholder="••••••")
             yield self.master_input
-            with Horizontal():
-                yield Button("Skip", id="skip")
-                yield Button("Save (Enter)", id="ok", variant="primary")
+            yield _DialogButtons("Save (Enter)", cancel_label="Skip", cancel_id="skip")
 
     def on_mount(self) -> None:  # pragma: no cover
         self.set_focus(self.box_input)
@@ -189,20 +337,8 @@ class InitialSetupModal(ModalScreen[Optional[InitialSetupResult]]):
             master = None
         self.dismiss(InitialSetupResult(box_name=box_name, master_key=master))
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        if event.button.id == "skip":
-            self.dismiss(None)
-        else:
-            self._submit()
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            self._submit()
-
-
-class SetMasterPasswordModal(ModalScreen[Optional[str]]):
+class SetMasterPasswordModal(_KeyDismissModal[Optional[str]]):
     """Modal to set the master password for encryption after initial setup."""
 
     def compose(self) -> ComposeResult:  # pragma: no cover - UI only
@@ -215,9 +351,7 @@ class SetMasterPasswordModal(ModalScreen[Optional[str]]):
             yield Label("Confirm Password")
             self.confirm_input = Input(placeholder="••••••", password=True)
             yield self.confirm_input
-            with Horizontal():
-                yield Button("Cancel", id="cancel")
-                yield Button("Set Password", id="ok", variant="primary")
+            yield _DialogButtons("Set Password", cancel_label="Cancel")
 
     def on_mount(self) -> None:  # pragma: no cover
         self.set_focus(self.password_input)
@@ -233,27 +367,34 @@ class SetMasterPasswordModal(ModalScreen[Optional[str]]):
             return
         self.dismiss(password)
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        if event.button.id == "cancel":
-            self.dismiss(None)
-        else:
-            self._submit()
-
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            self._submit()
-
 
 class LiveSearchResult:
     """Result from live search - selected box and file."""
 
+    __slots__ = ("box_id", "file_id")
+
     def __init__(self, box_id: str, file_id: str):
         self.box_id = box_id
         self.file_id = file_id
 
 
+# Above this many accessible files live search queries FTS instead of
+# holding an in-memory index.
+_USE_SQL_THRESHOLD = 50_000
+
+# Keystrokes this close together (seconds) collapse into one FTS query.
+_FTS_DEBOUNCE = 0.15
+
+
+class _SearchHit(NamedTuple):
+    """Row shown in the live search tree."""
+
+    file_id: str
+    box_id: str
+    filename: str
+    size: int
+
+
 class LiveSearchScreen(ModalScreen[Optional[LiveSearchResult]]):
     """Telescope-style live search with hierarchical results."""
 
@@ -284,19 +425,79 @@ class LiveSearchScreen(ModalScreen[Optional[LiveSearchResult]]):
     def __init__(self, ctx: "AppContext"):
         super().__init__()
         self.ctx = ctx
-        self._debounce_timer = None
-        # Cache: box_id -> box_name
+        # Cache: box_id -> box_name, and box_id -> tree label markup
         self._box_names: dict[str, str] = {}
-        self._load_box_names()
+        self._box_labels: dict[str, str] = {}
+        # None means the dataset is too large (or failed to load): use FTS.
+        self._index: Optional[FuzzyIndex[_SearchHit]] = None
+        # Set once the loader worker has filled _box_names and _index.
+        self._loaded = threading.Event()
+        # Nodes currently in the results tree, reused across keystrokes.
+        self._box_nodes: dict[str, TreeNode] = {}
+        self._current_nodes: dict[tuple[str, str], TreeNode] = {}
+        # File leaves are only built once a box is expanded; until then the
+        # box holds a single placeholder leaf.
+        self._placeholders: dict[str, TreeNode] = {}
+        self._box_hits: dict[str, list] = {}
+        self._result_keys: set[tuple[str, str]] = set()
+        # Pending debounced FTS search
+        self._search_timer: Optional[Timer] = None
+
+    def _load_search_data(self) -> None:
+        """Worker that loads box names and the fuzzy index (runs in thread)."""
+        try:
+            self._load_box_names()
+            self._load_index()
+        finally:
+            self._loaded.set()
 
     def _load_box_names(self) -> None:
-        """Pre-load box names for display."""
+        """Pre-load box names for display, reusing the context cache."""
         try:
-            user_boxes = self.ctx.fm.list_user_boxes(self.ctx.user.user_id)
-            for box in user_boxes:
-                self._box_names[box.box_id] = box.box_name
+            names = self.ctx.box_names()
         except Exception:
-            pass
+            return
+        for box_id, box_name in names.items():
+            self._box_names[box_id] = box_name
+            self._box_labels[box_id] = f"[bold]{box_name}[/bold]"
+
+    def _load_index(self) -> None:
+        """Load filename/tags of all accessible files into a fuzzy index."""
+        user_id = self.ctx.user.user_id
+        sql = """
+            SELECT DISTINCT f.file_id, f.box_id, f.filename, f.size,
+                (SELECT GROUP_CONCAT(t.tag_name, ' ') FROM tags t
+                 WHERE t.entity_type = 'file' AND t.entity_id = f.file_id) AS tags
+            FROM files f
+            JOIN boxes b ON f.box_id = b.box_id
+            LEFT JOIN box_shares bs
+                ON bs.box_id = b.box_id
+                AND bs.shared_with_user_id = ?
+            WHERE f.status != 'deleted'
+              AND (
+                  b.user_id = ?
+                  OR (
+                      bs.share_id IS NOT NULL
+                      AND (bs.expires_at IS NULL OR bs.expires_at > CURRENT_TIMESTAMP)
+                  )
+              )
+            LIMIT ?
+        """
+        try:
+            rows = self.ctx.db.fetch_all(
+                sql, (user_id, user_id, _USE_SQL_THRESHOLD + 1)
+            )
+        except Exception:
+            return
+        if len(rows) > _USE_SQL_THRESHOLD:
+            return
+        self._index = FuzzyIndex(
+            (
+                f"{r['filename']} {r['tags'] or ''}",
+                _SearchHit(r["file_id"], r["box_id"], r["filename"], r["size"]),
+            )
+            for r in rows
+        )
 
     def compose(self) -> ComposeResult:
         with Vertical():
@@ -309,25 +510,52 @@ class LiveSearchScreen(ModalScreen[Optional[LiveSearchResult]]):
         self.query_one("#search-input", Input).focus()
         tree = self.query_one("#results-tree", Tree)
         tree.show_root = False
+        self.run_worker(
+            self._load_search_data,
+            name="load_search_data",
+            thread=True,
+        )
 
     @on(Input.Changed, "#search-input")
     def on_search_changed(self, event: Input.Changed) -> None:
-        """Debounced live search as user types."""
-        if self._debounce_timer:
-            self._debounce_timer.stop()
-        self._debounce_timer = self.set_timer(0.15, self._do_search)
+        """Live search as user types; a new keystroke cancels the last search.
+
+        The in-memory index answers at once. Queries that would go to FTS
+        (large datasets, or while the index is still loading) are debounced
+        so typing a word runs one query instead of one per keystroke.
+        """
+        query = event.value.strip()
+        timer, self._search_timer = self._search_timer, None
+        if timer is not None:
+            timer.stop()
+        if query and self._index is None:
+            self._search_timer = self.set_timer(
+                _FTS_DEBOUNCE, lambda: self._start_search(query)
+            )
+        else:
+            self._start_search(query)
+
+    def _start_search(self, query: str) -> None:
+        self._search_timer = None
+        self.run_worker(
+            lambda: self._do_search(query),
+            name="search_worker",
+            group="search",
+            exclusive=True,
+            thread=True,
+        )
 
     def _search_accessible_files(self, term: str, limit: int = 100):
         """Search files in all accessible boxes (owned + shared).
         
         Unlike fuzzy_search_fts which only searches user's own files,
-        this includes files from boxes shared with the user.
+        this includes files from boxes shared with the user. Returns
+        _SearchHit tuples, the same shape the in-memory index yields.
         """
-        # Build prefix-match tokens for FTS
-        tokens = [t for t in term.strip().split() if t]
-        if not tokens:
+        # Build prefix-match tokens for FTS; split() already drops blanks
+        fts_query = " ".join(f"{t}*" for t in term.split())
+        if not fts_query:
             return []
-        fts_query = " ".join(t + "*" for t in tokens)
         
         user_id = self.ctx.user.user_id
         
@@ -335,7 +563,8 @@ class LiveSearchScreen(ModalScreen[Optional[LiveSearchResult]]):
         # - Files in boxes owned by the user, OR
         # - Files in boxes shared with the user (non-expired)
         sql = """
-            SELECT DISTINCT f.*, bm25(files_fts) AS rank
+            SELECT DISTINCT f.file_id, f.box_id, f.filename, f.size,
+                bm25(files_fts) AS rank
             FROM files_fts
             JOIN files f ON f.file_id = files_fts.file_id
             JOIN boxes b ON f.box_id = b.box_id
@@ -357,59 +586,151 @@ class LiveSearchScreen(ModalScreen[Optional[LiveSearchResult]]):
         
         rows = self.ctx.db.fetch_all(sql, (user_id, fts_query, user_id, limit))
         
-        # Convert rows to FileMetadata with tags
-        file_ids = [r["file_id"] for r in rows]
-        tm = tags_map(self.ctx.db, file_ids)
-        return [row_to_metadata(r, tm.get(r["file_id"], [])) for r in rows]
+        # Results only show name and size, so skip FileMetadata and tags.
+        return [
+            _SearchHit(r["file_id"], r["box_id"], r["filename"], r["size"])
+            for r in rows
+        ]
+
+    def _do_search(self, query: str) -> None:
+        """Worker that runs the search and hands hits to the UI thread."""
+        hits: list = []
+        error: Optional[str] = None
+        if query:
+            self._loaded.wait()
+            try:
+                # Search files in all accessible boxes (owned + shared)
+                if self._index is not None:
+                    hits = self._index.search(query, limit=100)
+                else:
+                    hits = self._search_accessible_files(query, limit=100)
+            except Exception as exc:
+                error = f"Search error: {exc}"
+        if get_current_worker().is_cancelled:
+            return
+        self.app.call_from_thread(self._render_results, query, hits, error)
+
+    def _clear_results(self) -> None:
+        self.query_one("#results-tree", Tree).clear()
+        self._box_nodes.clear()
+        self._current_nodes.clear()
+        self._placeholders.clear()
+        self._box_hits = {}
+        self._result_keys = set()
+
+    def _render_results(
+        self, query: str, hits: list, error: Optional[str] = None
+    ) -> None:
+        """Update the results tree in place (UI thread).
 
-    def _do_search(self) -> None:
-        """Execute search and update tree."""
-        query = self.query_one("#search-input", Input).value.strip()
+        Nodes for hits that are still present are kept; only the removed
+        and newly matched files touch the tree. Boxes start collapsed with a
+        placeholder leaf, file leaves are built when a box is expanded.
+        """
         tree = self.query_one("#results-tree", Tree)
         status = self.query_one("#status-line", Static)
 
-        tree.clear()
-
         if not query:
+            self._clear_results()
             status.update("Type to search...")
             return
 
-        try:
-            # Search files in all accessible boxes (owned + shared)
-            hits = self._search_accessible_files(query, limit=100)
-        except Exception as exc:
-            status.update(f"Search error: {exc}")
+        if error:
+            self._clear_results()
+            status.update(error)
             return
 
         if not hits:
+            self._clear_results()
             status.update("No results")
             return
 
         # Group by box_id
-        by_box: dict[str, list] = {}
+        by_box: dict[str, list] = defaultdict(list)
         for f in hits:
-            if f.box_id not in by_box:
-                by_box[f.box_id] = []
             by_box[f.box_id].append(f)
+        status_text = f"{len(hits)} file(s) in {len(by_box)} box(es)"
+
+        new_keys = {(f.box_id, f.file_id) for f in hits}
+        if new_keys == self._result_keys:
+            status.update(status_text)
+            return
+        self._result_keys = new_keys
+        self._box_hits = by_box
+
+        # One refresh for the whole update rather than one per node.
+        with self.app.batch_update():
+            for key in self._current_nodes.keys() - new_keys:
+                self._current_nodes.pop(key).remove()
+            for box_id in self._box_nodes.keys() - by_box.keys():
+                self._box_nodes.pop(box_id).remove()
+                self._placeholders.pop(box_id, None)
+
+            prev_box = None
+            for box_id, files in by_box.items():
+                box_node = self._box_nodes.get(box_id)
+                if box_node is None:
+                    label = (
+                        self._box_labels.get(box_id) or f"[bold]{box_id[:8]}[/bold]"
+                    )
+                    if prev_box is None and tree.root.children:
+                        box_node = tree.root.add(label, before=0)
+                    else:
+                        box_node = tree.root.add(label, after=prev_box)
+                    box_node.data = {"type": "box", "box_id": box_id}
+                    self._box_nodes[box_id] = box_node
+                    self._placeholders[box_id] = box_node.add_leaf(
+                        "", {"type": "placeholder"}
+                    )
+                prev_box = box_node
 
-        # Build tree
-        file_count = 0
-        for box_id, files in by_box.items():
-            box_name = self._box_names.get(box_id, box_id[:8])
-            box_node = tree.root.add(f"[bold]{box_name}[/bold]", expand=True)
-            box_node.data = {"type": "box", "box_id": box_id}
-
-            for f in files:
-                size_str = _human_size(f.size)
-                file_node = box_node.add_leaf(f"{f.filename}  [dim]{size_str}[/dim]")
+                placeholder = self._placeholders.get(box_id)
+                if placeholder is not None:
+                    placeholder.set_label(f"[dim]{len(files)} file(s) - expand[/dim]")
+                else:
+                    self._fill_box(box_id)
+
+            # A single box is cheap to show in full.
+            if len(by_box) == 1:
+                box_id = next(iter(by_box))
+                self._fill_box(box_id)
+                self._box_nodes[box_id].expand()
+
+        status.update(status_text)
+
+    def _fill_box(self, box_id: str) -> None:
+        """Replace a box's placeholder with (or update) its file leaves."""
+        box_node = self._box_nodes[box_id]
+        placeholder = self._placeholders.pop(box_id, None)
+        if placeholder is not None:
+            placeholder.remove()
+
+        prev_leaf = None
+        for f in self._box_hits.get(box_id, ()):
+            key = (box_id, f.file_id)
+            file_node = self._current_nodes.get(key)
+            if file_node is None:
+                label = f"{f.filename}  [dim]{_human_size(f.size)}[/dim]"
+                if prev_leaf is None and box_node.children:
+                    file_node = box_node.add_leaf(label, before=0)
+                else:
+                    file_node = box_node.add_leaf(label, after=prev_leaf)
                 file_node.data = {
                     "type": "file",
                     "box_id": box_id,
                     "file_id": f.file_id,
                 }
-                file_count += 1
+                self._current_nodes[key] = file_node
+            prev_leaf = file_node
 
-        status.update(f"{file_count} file(s) in {len(by_box)} box(es)")
+    @on(Tree.NodeExpanded, "#results-tree")
+    def on_tree_expanded(self, event: Tree.NodeExpanded) -> None:
+        """Build a box's file leaves the first time it is expanded."""
+        node_data = event.node.data
+        if node_data and node_data.get("type") == "box":
+            if node_data["box_id"] in self._placeholders:
+                with self.app.batch_update():
+                    self._fill_box(node_data["box_id"])
 
     @on(Tree.NodeSelected, "#results-tree")
     def on_tree_selected(self, event: Tree.NodeSelected) -> None:
@@ -431,7 +752,7 @@ class LiveSearchScreen(ModalScreen[Optional[LiveSearchResult]]):
             self.dismiss(None)
 
 
-class FileVersionsModal(ModalScreen):
+class FileVersionsModal(_KeyDismissModal[Optional[str]]):
     """
     Simple dialog that lists versions (historical) for a file and lets the user pick one to restore
     """
@@ -444,19 +765,19 @@ class FileVersionsModal(ModalScreen):
 
     def compose(self) -> ComposeResult:
         with Vertical(classes="dialog"):
-            yield Static("Versions for : %s" % self.filename, classes="title")
-            self.list_view = ListView()
-            for row in self.versions:
-                number = row.get("version_number", row.get("version", "?"))
-                size = row.get("size", 0)
-                created_at = row.get("created_at", "")
-                label = "v%s . %s bytes . %s" % (number, size, created_at)
-                item = ListItem(Static(label))
-                self.list_view.append(item)
+            yield Static(f"Versions for : {self.filename}", classes="title")
+            items = [
+                ListItem(
+                    Static(
+                        f"v{row.get('version_number', row.get('version', '?'))}"
+                        f" . {row.get('size', 0)} bytes . {row.get('created_at', '')}"
+                    )
+                )
+                for row in self.versions
+            ]
+            self.list_view = ListView(*items)
             yield self.list_view
-            with Horizontal():
-                yield Button("Cancel (Esc)", id="cancel")
-                yield Button("Restore (Enter)", id="ok", variant="primary")
+            yield _DialogButtons("Restore (Enter)")
 
     def on_mount(self) -> None:
         if self.list_view is not None:
@@ -475,28 +796,11 @@ class FileVersionsModal(ModalScreen):
         row = self.versions[idx]
         return row.get("version_id")
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:
-        if event.button.id == "cancel":
-            self.dismiss(None)
-            return
-        version_id = self.selected_version_id()
-        if not version_id:
-            self.dismiss(None)
-            return
-        self.dismiss(version_id)
-
-    def on_key(self, event) -> None:
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            version_id = self.selected_version_id()
-            if not version_id:
-                self.dismiss(None)
-            else:
-                self.dismiss(version_id)
+    def _submit(self) -> None:
+        self.dismiss(self.selected_version_id() or None)
 
 
-class TagSearchModal(ModalScreen):
+class TagSearchModal(_KeyDismissModal[Optional[str]]):
     """
     Dialog to ask for a tag name and return it
     """
@@ -510,41 +814,31 @@ class TagSearchModal(ModalScreen):
             yield Static("Filter by Tag", classes="title")
             self.tag_input = Input(placeholder="tag name")
             yield self.tag_input
-            with Horizontal():
-                yield Button("Cancel (Esc)", id="cancel")
-                yield Button("Filter (Enter)", id="ok", variant="primary")
+            yield _DialogButtons("Filter (Enter)")
 
-    def on_mount(self) -> None:
+    def on_screen_resume(self) -> None:
+        # The app reuses one instance (see ShadowBoxApp._modal).
         if self.tag_input is not None:
+            self.tag_input.value = ""
             self.set_focus(self.tag_input)
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:
-        if event.button.id == "cancel":
-            self.dismiss(None)
-            return
+    def _submit(self) -> None:
         value = ""
         if self.tag_input is not None:
             value = self.tag_input.value.strip()
         self.dismiss(value or None)
 
-    def on_key(self, event) -> None:
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            value = ""
-            if self.tag_input is not None:
-                value = self.tag_input.value.strip()
-            self.dismiss(value or None)
-
 
 class NewBoxResult:
+    __slots__ = ("name", "description", "encrypt")
+
     def __init__(self, name: str, description: str | None, encrypt: bool):
         self.name = name
         self.description = description
         self.encrypt = encrypt
 
 
-class NewBoxModal(ModalScreen[Optional[NewBoxResult]]):
+class NewBoxModal(_KeyDismissModal[Optional[NewBoxResult]]):
     def __init__(self, encrypt_ready: bool = True):
         super().__init__()
         # When False, the checkbox is disabled to reflect that the backend
@@ -565,17 +859,12 @@ class NewBoxModal(ModalScreen[Optional[NewBoxResult]]):
             )
             self.encrypt_box = Checkbox(label, disabled=not self.encrypt_ready)
             yield self.encrypt_box
-            with Horizontal():
-                yield Button("Cancel (Esc)", id="cancel")
-                yield Button("Create (Enter)", id="ok", variant="primary")
+            yield _DialogButtons("Create (Enter)")
 
     def on_mount(self) -> None:  # pragma: no cover
         self.set_focus(self.name_input)
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        if event.button.id == "cancel":
-            self.dismiss(None)
-            return
+    def _submit(self) -> None:
         self.dismiss(
             NewBoxResult(
                 name=self.name_input.value.strip(),
@@ -584,20 +873,10 @@ class NewBoxModal(ModalScreen[Optional[NewBoxResult]]):
             )
         )
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            self.dismiss(
-                NewBoxResult(
-                    name=self.name_input.value.strip(),
-                    description=self.desc_input.value.strip() or None,
-                    encrypt=self.encrypt_box.value,
-                )
-            )
 
+class DeleteConfirmModal(_KeyDismissModal[Optional[bool]]):
+    CANCEL_RESULT = False
 
-class DeleteConfirmModal(ModalScreen[Optional[bool]]):
     def __init__(self, prompt: str):
         super().__init__()
         self.prompt = prompt
@@ -605,24 +884,13 @@ class DeleteConfirmModal(ModalScreen[Optional[bool]]):
     def compose(self) -> ComposeResult:  # pragma: no cover
         with Vertical(classes="dialog"):
             yield Static(self.prompt)
-            with Horizontal():
-                yield Button("Cancel (Esc)", id="cancel")
-                yield Button("Delete (Enter)", id="ok", variant="error")
+            yield _DialogButtons("Delete (Enter)", ok_variant="error")
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        if event.button.id == "cancel":
-            self.dismiss(False)
-        else:
-            self.dismiss(True)
-
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(False)
-        elif event.key == "enter":
-            self.dismiss(True)
+    def _submit(self) -> None:
+        self.dismiss(True)
 
 
-class AlertModal(ModalScreen[None]):
+class AlertModal(_KeyDismissModal[None]):
     """Simple alert modal with a title, message, and OK button."""
 
     def __init__(self, title: str, message: str):
@@ -636,20 +904,17 @@ class AlertModal(ModalScreen[None]):
             yield Static("")
             yield Static(self.alert_message)
             yield Static("")
-            with Horizontal():
-                yield Button("OK", id="ok", variant="primary")
+            yield _DialogButtons("OK", cancel_label=None)
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
+    def _submit(self) -> None:
         self.dismiss(None)
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key in ("escape", "enter"):
-            self.dismiss(None)
-
 
-class ReplaceShareConfirmModal(ModalScreen[Optional[bool]]):
+class ReplaceShareConfirmModal(_KeyDismissModal[Optional[bool]]):
     """Confirmation modal for replacing an existing share."""
 
+    CANCEL_RESULT = False
+
     def __init__(self, current_box_name: str, new_box_name: str):
         super().__init__()
         self.current_box_name = current_box_name
@@ -663,21 +928,13 @@ class ReplaceShareConfirmModal(ModalScreen[Optional[bool]]):
             yield Static(f"New share: {self.new_box_name}")
             yield Static("")
             yield Static("Stop current share and start new one?")
-            with Horizontal():
-                yield Button("Cancel", id="cancel")
-                yield Button("Replace", id="ok", variant="warning")
-
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        self.dismiss(event.button.id == "ok")
+            yield _DialogButtons("Replace", ok_variant="warning", cancel_label="Cancel")
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(False)
-        elif event.key == "enter":
-            self.dismiss(True)
+    def _submit(self) -> None:
+        self.dismiss(True)
 
 
-class BoxInfoModal(ModalScreen[None]):
+class BoxInfoModal(_KeyDismissModal[None]):
     def __init__(self, box, info):
         super().__init__()
         self.box = box
@@ -698,15 +955,11 @@ class BoxInfoModal(ModalScreen[None]):
                 yield Static(line)
             yield Button("Close (Esc)", id="close")
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
+    def _submit(self) -> None:
         self.dismiss(None)
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key in ("escape", "enter"):
-            self.dismiss(None)
-
 
-class ErrorModal(ModalScreen[None]):
+class ErrorModal(_KeyDismissModal[None]):
     """Modal for displaying error messages prominently."""
 
     def __init__(self, title: str, message: str):
@@ -721,23 +974,21 @@ class ErrorModal(ModalScreen[None]):
             yield Static("")
             yield Button("OK", id="ok", variant="primary")
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
+    def _submit(self) -> None:
         self.dismiss(None)
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key in ("escape", "enter"):
-            self.dismiss(None)
-
 
 class ShareBoxResult:
     """Result from the share modal - contains share type and write users."""
 
+    __slots__ = ("is_public", "write_usernames")
+
     def __init__(self, is_public: bool, write_usernames: list[str]):
         self.is_public = is_public
         self.write_usernames = write_usernames  # List of usernames with write access
 
 
-class ShareBoxModal(ModalScreen[Optional[ShareBoxResult]]):
+class ShareBoxModal(_KeyDismissModal[Optional[ShareBoxResult]]):
     """Modal to initiate sharing a box over LAN via mDNS."""
 
     def __init__(self, box_name: str):
@@ -755,9 +1006,7 @@ class ShareBoxModal(ModalScreen[Optional[ShareBoxResult]]):
             yield Label("Users with WRITE permission (comma-separated):")
             self.write_users_input = Input(placeholder="alice, bob, charlie")
             yield self.write_users_input
-            with Horizontal():
-                yield Button("Cancel (Esc)", id="cancel")
-                yield Button("Share (Enter)", id="ok", variant="primary")
+            yield _DialogButtons("Share (Enter)")
 
     def on_mount(self) -> None:  # pragma: no cover
         self.set_focus(self.public_checkbox)
@@ -772,21 +1021,14 @@ class ShareBoxModal(ModalScreen[Optional[ShareBoxResult]]):
             )
         )
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        if event.button.id == "cancel":
-            self.dismiss(None)
-        else:
-            self._submit()
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            self._submit()
+class ShareCodeModal(_KeyDismissModal[None]):
+    """Modal displaying the generated share code with copy functionality.
 
+    Enter copies the code and closes; the Copy button copies and stays open.
+    """
 
-class ShareCodeModal(ModalScreen[None]):
-    """Modal displaying the generated share code with copy functionality."""
+    CANCEL_IDS = ("done",)
 
     def __init__(
         self,
@@ -825,36 +1067,36 @@ class ShareCodeModal(ModalScreen[None]):
                     yield Button("Copy Code", id="copy")
                 yield Button("Done", id="done", variant="primary")
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        if event.button.id == "copy":
-            try:
-                copy_to_clipboard(self.code)
-                self.notify("Code copied to clipboard!")
-            except Exception:
-                self.notify("Could not copy to clipboard", severity="error")
+    def _copy_code(self) -> None:
+        from shadowbox.frontend.cli.clipboard import copy_to_clipboard
+
+        try:
+            copy_to_clipboard(self.code)
+            self.notify("Code copied to clipboard!")
+        except Exception:
+            self.notify("Could not copy to clipboard", severity="error")
+
+    def _press(self, button_id: Optional[str]) -> None:
+        if button_id == "copy":
+            self._copy_code()
         else:
-            self.dismiss(None)
+            super()._press(button_id)
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "enter":
-            if self.code:
-                try:
-                    copy_to_clipboard(self.code)
-                    self.notify("Code copied to clipboard!")
-                except Exception:
-                    self.notify("Could not copy to clipboard", severity="error")
-            self.dismiss(None)
-        elif event.key == "escape":
-            self.dismiss(None)
+    def _submit(self) -> None:
+        if self.code:
+            self._copy_code()
+        self.dismiss(None)
 
 
 class EditFileResult:
+    __slots__ = ("tags", "description")
+
     def __init__(self, tags: str, description: str):
         self.tags = tags
         self.description = description
 
 
-class EditFileModal(ModalScreen[Optional[EditFileResult]]):
+class EditFileModal(_KeyDismissModal[Optional[EditFileResult]]):
     def __init__(self, filename: str, tags: str, description: str):
         super().__init__()
         self.filename = filename
@@ -870,34 +1112,25 @@ class EditFileModal(ModalScreen[Optional[EditFileResult]]):
             yield Label("Description")
             self.desc_input = Input(value=self.initial_desc)
             yield self.desc_input
-            with Horizontal():
-                yield Button("Cancel (Esc)", id="cancel")
-                yield Button("Save (Enter)", id="ok", variant="primary")
+            yield _DialogButtons("Save (Enter)")
 
     def on_mount(self) -> None:  # pragma: no cover
         self.set_focus(self.tags_input)
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        if event.button.id == "cancel":
-            self.dismiss(None)
-            return
+    def _submit(self) -> None:
         self.dismiss(EditFileResult(self.tags_input.value, self.desc_input.value))
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            self.dismiss(EditFileResult(self.tags_input.value, self.desc_input.value))
-
 
 class ConnectResult:
     """Result from connect modal - the 4-letter code entered."""
 
+    __slots__ = ("code",)
+
     def __init__(self, code: str):
         self.code = code
 
 
-class ConnectModal(ModalScreen[Optional[ConnectResult]]):
+class ConnectModal(_KeyDismissModal[Optional[ConnectResult]]):
     """Modal to enter a 4-letter share code to connect to a remote box."""
 
     def compose(self) -> ComposeResult:  # pragma: no cover
@@ -909,9 +1142,7 @@ class ConnectModal(ModalScreen[Optional[ConnectResult]]):
             yield Static("")
             self.status_label = Static("")
             yield self.status_label
-            with Horizontal():
-                yield Button("Cancel (Esc)", id="cancel")
-                yield Button("Connect (Enter)", id="ok", variant="primary")
+            yield _DialogButtons("Connect (Enter)")
 
     def on_mount(self) -> None:  # pragma: no cover
         self.set_focus(self.code_input)
@@ -923,20 +1154,8 @@ class ConnectModal(ModalScreen[Optional[ConnectResult]]):
             return
         self.dismiss(ConnectResult(code=code))
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
-        if event.button.id == "cancel":
-            self.dismiss(None)
-        else:
-            self._submit()
-
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key == "escape":
-            self.dismiss(None)
-        elif event.key == "enter":
-            self._submit()
-
 
-class ConnectSuccessModal(ModalScreen[None]):
+class ConnectSuccessModal(_KeyDismissModal[None]):
     """Modal showing successful connection to a remote box."""
 
     def __init__(self, code: str, ip: str, port: int, files_preview: str):
@@ -955,16 +1174,11 @@ class ConnectSuccessModal(ModalScreen[None]):
             yield Static("Files:")
             yield Static(self.files_preview or "(empty)")
             yield Static("")
-            with Horizontal():
-                yield Button("Close", id="close", variant="primary")
+            yield _DialogButtons("Close", ok_id="close", cancel_label=None)
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:  # pragma: no cover
+    def _submit(self) -> None:
         self.dismiss(None)
 
-    def on_key(self, event) -> None:  # pragma: no cover
-        if event.key in ("escape", "enter"):
-            self.dismiss(None)
-
 
 class ShadowBoxApp(App):
     """Textual scaffold showing boxes and files; ready to extend."""
@@ -1001,7 +1215,11 @@ class ShadowBoxApp(App):
     ]
 
     def __init__(self, ctx: AppContext | None = None):
-        self.ctx = ctx or build_context()
+        if ctx is None:
+            from shadowbox.frontend.cli.context import build_context
+
+            ctx = build_context()
+        self.ctx = ctx
         super().__init__()
 
         self.boxes: ListView | None = None
@@ -1009,22 +1227,89 @@ class ShadowBoxApp(App):
         self.public_boxes: ListView | None = None
         self.table: DataTable | None = None
         self.status: Static | None = None
+        # Keys of every row in the current listing, in table order. Only a
+        # prefix of _table_rows is materialized in the DataTable at a time.
         self.row_keys: list[str] = []
+        # file_id -> position in row_keys, for jumping straight to a file.
+        self._row_index: dict[str, int] = {}
+        # Rows shown in the box lists: key -> (ListItem, Static, text); see
+        # _sync_list. Keyed by box_id for owned boxes, share code for remote.
+        self._box_items: dict[str, tuple] = {}
+        self._shared_items: dict[str, tuple] = {}
+        self._public_items: dict[str, tuple] = {}
+        self._table_rows: list[tuple[str, tuple]] = []
+        # file_id -> ((modified_at, size), formatted cells) for the files of
+        # the last listed local box; entries are dropped when a file is
+        # edited, deleted or restored.
+        self._row_cache: dict[str, tuple[tuple, tuple]] = {}
+        # Set when used/quota bytes may have changed; _update_status only
+        # re-reads the user row while this is True or the last read is older
+        # than _USER_ROW_TTL.
+        self._user_row_dirty: bool = True
+        self._user_row_at = float("-inf")
+        # (ip, port) -> (fetched_at, files) for recently listed remote boxes
+        self._remote_list_cache: dict[tuple[str, int], tuple[float, list[dict]]] = {}
+        # Pending debounced refresh_files after a sidebar highlight
+        self._highlight_timer: Optional[Timer] = None
         # Track active shares: box_id -> (zeroconf, info, code, is_public, stop_event, granted_user_ids)
         # granted_user_ids is a set of user_ids that were granted access during this session
         self.active_shares: dict[str, tuple] = {}
         # Track boxes currently being set up for sharing (loading state)
         self.pending_shares: set[str] = set()
+        # Bumped by _shares_changed whenever either share map mutates; keys the
+        # sidebar indicator cache.
+        self._shares_version = 0
+        self._indicator_cache: dict[tuple[str, int], str] = {}
         # Discovered public boxes on LAN: code -> {name, ip, port}
         self.discovered_public: dict[str, dict] = {}
+        # Long-lived mDNS browser; its callbacks keep _live_public current and
+        # the UI tick publishes it to discovered_public when it changed.
+        self._zeroconf = None
+        self._public_browser = None
+        self._live_public: dict[str, dict] = {}
+        self._public_dirty = False
+        # code -> monotonic time of the last successful contact with a connected box
+        self._last_seen: dict[str, float] = {}
+        # box_id -> permission level for boxes shared with the user; rebuilt
+        # lazily after each refresh_boxes
+        self._perm_cache: Optional[dict[str, str]] = None
+        # Seconds since mount, counted by _tick
+        self._tick_n = 0
+        # Min-heap of (renew_at, box_id) for active shares; _share_renew_at
+        # holds the current due time so superseded heap entries are skipped.
+        self._share_heap: list[tuple[float, str]] = []
+        self._share_renew_at: dict[str, float] = {}
         # Connected remote boxes: code -> {code, ip, port, name}
         self.connected_boxes: dict[str, dict] = {}
+        # Set when connected_boxes membership changed since the last _save_peers
+        self._peers_dirty = False
+        # code -> consecutive failed liveness probes
+        self._probe_failures: dict[str, int] = {}
+        # monotonic time the last liveness probe round started
+        self._liveness_at = float("-inf")
+        # Share code of the connect lookup in flight, if any
+        self._connecting: Optional[str] = None
+        # Stateless modals kept installed between openings, by class
+        self._modals: dict[type, ModalScreen] = {}
+        # reason -> connections dropped since the last toast
+        self._drop_notices: dict[str, int] = {}
         # Currently active remote box (if any): {type, code, ip, port, name}
         self.active_remote_box: dict | None = None
         # Whether we're currently viewing a remote box's files
         self.viewing_remote: bool = False
         # Permission level for the currently active box ("read", "write", "admin", or "owner")
         self.active_box_permission: str = "owner"
+        # Thread/async worker name -> handler for its (truthy) result
+        self._worker_handlers: dict[str, Callable[..., None]] = {
+            "_check_liveness_worker": self._on_liveness_done,
+            "share_worker": self._on_share_done,
+            "connect_worker": self._on_connect_done,
+            "fetch_remote_files_worker": self._on_fetch_remote_files_done,
+            "remote_download_worker": self._on_remote_download_done,
+            "remote_upload_worker": self._on_remote_upload_done,
+            "remote_batch_upload_worker": self._on_remote_batch_upload_done,
+            "remote_delete_worker": self._on_remote_delete_done,
+        }
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
@@ -1051,15 +1336,16 @@ class ShadowBoxApp(App):
         # Configure table columns once.
         assert self.table is not None
         self.table.add_columns("Name", "Size", "Tags", "Status", "Modified")
+        self.watch(self.table, "scroll_y", self._on_files_scrolled, init=False)
+        restored = self._load_peers()
         self.refresh_boxes()
         self.refresh_files()
-        # Discover public boxes immediately, then every 10 seconds
+        # Browse for public boxes in the background; periodic work runs off _tick
         self._discover_public_boxes()
-        self.set_interval(10.0, self._discover_public_boxes)
-        # Check connected box liveness every 30 seconds
-        self.set_interval(30.0, self._check_connected_box_liveness)
-        # extend share TTL every 3 seconds (shares expire after 10s without)
-        self.set_interval(3.0, self._extend_share_expiration)
+        self.set_interval(1.0, self._tick)
+        if restored:
+            # Prune remembered boxes that went away while we were closed.
+            self._check_connected_box_liveness()
 
         # First-run setup: prompt for initial box and optional master key.
         if getattr(self.ctx, "first_run", False):
@@ -1078,6 +1364,7 @@ class ShadowBoxApp(App):
         """
         # Ensure we don't re-run the first-run flow in this session.
         self.ctx.first_run = False
+        self.ctx.invalidate_boxes()
 
         box = None
 
@@ -1139,55 +1426,149 @@ class ShadowBoxApp(App):
         self.refresh_files()
         self._set_status(f"Ready - active box: {box.box_name}")
 
-    def refresh_boxes(self) -> None:
+    def _modal(self, cls: type[_M]) -> _M:
+        """Return the app's one instance of a modal that holds no state.
+
+        The instance is installed on first use so dismissing it keeps its
+        widgets; later openings skip compose and mount. Such modals reset
+        their inputs in ``on_screen_resume``.
+        """
+        screen = self._modals.get(cls)
+        if screen is None:
+            screen = self._modals[cls] = cls()
+            self.install_screen(screen, name=cls.__name__)
+        return screen
+
+    def refresh_boxes(self, user_boxes: Optional[list[Box]] = None) -> None:
+        """Bring the sidebar in line with the user's boxes.
+
+        Callers that just listed the boxes can pass them in as ``user_boxes``
+        to skip the query.
+        """
         assert self.boxes is not None
-        self.boxes.clear()
-        if self.shared_boxes:
-            self.shared_boxes.clear()
-        try:
-            user_boxes = self.ctx.fm.list_user_boxes(self.ctx.user.user_id)
-        except Exception as exc:  # pragma: no cover - UI only
-            self._set_status(f"Error loading boxes: {exc}")
-            return
-
-        for box in user_boxes:
-            # Show indicator based on share status
-            if box.box_id in self.pending_shares:
-                indicator = r"\[...] "  # Loading/pending
-            elif box.box_id in self.active_shares:
-                _, _, code, is_public, _, _ = self.active_shares[box.box_id]
-                indicator = r"\[P] " if is_public else f"\\[S:{code}] "
-            else:
-                indicator = ""
-            item = ListItem(Static(f"{indicator}{box.box_name}"))
-            item.data = box
-            self.boxes.append(item)
-        self.boxes.refresh()
+        self._perm_cache = None
+        # Repaint once after both box lists are rebuilt.
+        with self.batch_update():
+            self._sync_box_lists(user_boxes)
+
+    def _sync_box_lists(self, user_boxes: Optional[list[Box]] = None) -> None:
+        if user_boxes is None:
+            try:
+                user_boxes = self.ctx.fm.list_user_boxes(self.ctx.user.user_id)
+            except Exception as exc:  # pragma: no cover - UI only
+                self._set_status(f"Error loading boxes: {exc}")
+                return
+
+        active = self.ctx.active_box
+        active_id = active.box_id if active else None
+        active_idx = None
+        entries = []
+        for idx, box in enumerate(user_boxes):
+            if box.box_id == active_id:
+                active_idx = idx
+            indicator = self._share_indicator(box.box_id)
+            entries.append((box.box_id, f"{indicator}{box.box_name}", box))
+        changed = self._sync_list(self.boxes, self._box_items, entries)
 
         # Shared boxes: only show session-based remote connections (via code)
         if self.shared_boxes is not None:
-            for code, info in self.connected_boxes.items():
-                display = f"{info['name']} @ {info['ip']}"
-                item = ListItem(Static(display))
-                item.data = {"type": "remote", **info}
-                self.shared_boxes.append(item)
-            self.shared_boxes.refresh()
-
-        # Keep selection aligned with active box.
-        if self.ctx.active_box:
-            for idx, item in enumerate(self.boxes.children):
-                if (
-                    getattr(item, "data", None)
-                    and item.data.box_id == self.ctx.active_box.box_id
-                ):
-                    self.boxes.index = idx
-                    break
-
-    def refresh_files(self) -> None:
+            self._sync_list(
+                self.shared_boxes,
+                self._shared_items,
+                [
+                    (
+                        code,
+                        f"{info['name']} @ {info['ip']}",
+                        {"type": "remote", **info},
+                    )
+                    for code, info in self.connected_boxes.items()
+                ],
+            )
+
+        # Keep selection aligned with active box; _sync_list leaves the rows
+        # in entries order, so active_idx is its position in the list.
+        if active_idx is not None:
+            current = self.boxes.highlighted_child
+            if (
+                not changed
+                and current is not None
+                and current.data.box_id == active_id
+            ):
+                return
+            self.boxes.index = active_idx
+
+    def _share_indicator(self, box_id: str) -> str:
+        key = (box_id, self._shares_version)
+        indicator = self._indicator_cache.get(key)
+        if indicator is not None:
+            return indicator
+        # Show indicator based on share status
+        if box_id in self.pending_shares:
+            indicator = r"\[...] "  # Loading/pending
+        elif box_id in self.active_shares:
+            _, _, code, is_public, _, _ = self.active_shares[box_id]
+            indicator = r"\[P] " if is_public else f"\\[S:{code}] "
+        else:
+            indicator = ""
+        self._indicator_cache[key] = indicator
+        return indicator
+
+    def _shares_changed(self) -> None:
+        """Call after mutating active_shares or pending_shares."""
+        self._shares_version += 1
+        self._indicator_cache.clear()
+
+    @staticmethod
+    def _sync_list(
+        view: ListView, items: dict, entries: list[tuple[str, str, object]]
+    ) -> bool:
+        """Bring ``view`` in line with ``entries`` of ``(key, text, data)``.
+
+        ``items`` maps key -> (ListItem, Static, text) for the rows currently
+        shown, in display order, and is updated in place. Unchanged rows are
+        left alone and changed labels are updated; removed rows are dropped
+        and new ones appended, unless the order changed, in which case the
+        list is rebuilt. Returns True if rows were added or removed.
+        """
+        new_keys = [key for key, _, _ in entries]
+        new_set = set(new_keys)
+        kept = [key for key in items if key in new_set]
+        if new_keys[: len(kept)] != kept:
+            view.clear()
+            items.clear()
+            kept = []
+        removed = [key for key in items if key not in new_set]
+        for key in removed:
+            items.pop(key)[0].remove()
+
+        for key, text, data in entries:
+            entry = items.get(key)
+            if entry is None:
+                label = Static(text)
+                item = ListItem(label)
+                view.append(item)
+                items[key] = (item, label, text)
+            else:
+                item, label, old_text = entry
+                if old_text != text:
+                    label.update(text)
+                    items[key] = (item, label, text)
+            item.data = data
+        return bool(removed) or len(kept) != len(new_keys)
+
+    def refresh_files(self, background: bool = False) -> None:
+        """Reload the active box's files into the table.
+
+        With ``background=True`` the query and row formatting run in a worker
+        thread and the table is filled when they finish, so switching to a
+        large box does not stall the UI.
+        """
         assert self.table is not None
+        # A synchronous reload supersedes any listing still in flight.
+        self.workers.cancel_group(self, "list_files")
+        self.workers.cancel_group(self, "remote_list")
         # Clear existing rows but keep column definitions intact.
-        self.table.clear(columns=False)
-        self.row_keys = []
+        self._fill_table([])
         self.viewing_remote = False
 
         if not self.ctx.active_box:
@@ -1196,31 +1577,147 @@ class ShadowBoxApp(App):
 
         # Update permission level for active box
         self.active_box_permission = self._get_box_permission(self.ctx.active_box)
+        box_id = self.ctx.active_box.box_id
 
-        try:
-            files: Iterable[FileMetadata] = self.ctx.fm.list_box_files(
-                self.ctx.active_box.box_id
+        if background:
+            self._set_status("Loading files...")
+            self.run_worker(
+                lambda: self._list_files_worker(box_id),
+                name="list_files_worker",
+                group="list_files",
+                exclusive=True,
+                thread=True,
             )
+            return
+
+        try:
+            rows = self._build_file_rows(box_id)
         except Exception as exc:  # pragma: no cover - UI-only
             self._set_status(f"Error loading files: {exc}")
             return
+        self._fill_table(rows)
 
-        for f in files:
-            tags = ", ".join(f.tags) if f.tags else "--"
-            status = f.status.value if hasattr(f.status, "value") else str(f.status)
-            modified = (
-                f.modified_at.isoformat(timespec="seconds")
-                if isinstance(f.modified_at, datetime)
-                else str(f.modified_at)
-            )
-            self.table.add_row(
-                f.filename, _human_size(f.size), tags, status, modified, key=f.file_id
-            )
-            self.row_keys.append(f.file_id)
+        self._update_status()
+
+    def _list_files_worker(self, box_id: str) -> None:
+        """Worker that loads and formats a box listing (runs in thread)."""
+        error: Optional[Exception] = None
+        try:
+            rows = self._build_file_rows(box_id)
+        except Exception as exc:  # pragma: no cover - UI-only
+            rows, error = [], exc
+        if get_current_worker().is_cancelled:
+            return
+        self.call_from_thread(self._apply_file_rows, box_id, rows, error)
 
+    def _apply_file_rows(
+        self, box_id: str, rows: list[tuple[str, tuple]], error: Optional[Exception]
+    ) -> None:
+        # Drop results for a box that is no longer on screen.
+        active = self.ctx.active_box
+        if self.active_remote_box is not None or active is None or active.box_id != box_id:
+            return
+        if error is not None:
+            self._set_status(f"Error loading files: {error}")
+            return
+        self._fill_table(rows)
         self._update_status()
 
+    def _build_file_rows(self, box_id: str) -> list[tuple[str, tuple]]:
+        """Query a box and return its ``(file_id, cells)`` table rows.
+
+        The row cache is rebuilt from this listing, so it only ever holds
+        the rows of one box.
+        """
+        cols = self.ctx.fm.list_box_files_columns(box_id)
+        rows: list[tuple[str, tuple]] = []
+        append = rows.append
+        cache: dict[str, tuple[tuple, tuple]] = {}
+        cache_get = self._row_cache.get
+        human_size = _human_size
+        fmt_modified = _fmt_modified
+        for file_id, filename, size, tags, status, modified in zip(
+            cols["file_id"],
+            cols["filename"],
+            cols["size"],
+            cols["tags"],
+            cols["status"],
+            cols["modified_at"],
+        ):
+            version = (modified, size)
+            cached = cache_get(file_id)
+            if cached is not None and cached[0] == version:
+                cache[file_id] = cached
+                append((file_id, cached[1]))
+                continue
+            cells = (
+                filename,
+                human_size(size),
+                ", ".join(tags) if tags else "--",
+                status,
+                fmt_modified(modified),
+            )
+            cache[file_id] = (version, cells)
+            append((file_id, cells))
+        self._row_cache = cache
+        return rows
+
+    def _fill_table(self, rows: list[tuple[str, tuple]]) -> None:
+        """Replace the files table contents with ``(key, cells)`` rows.
+
+        Only the first page is added to the DataTable; the rest follow as the
+        table scrolls (see _load_more_rows). row_keys covers every row.
+        """
+        assert self.table is not None
+        with self.batch_update():
+            self.table.clear(columns=False)
+            self._table_rows = rows
+            self.row_keys = [key for key, _ in rows]
+            self._row_index = {key: idx for idx, key in enumerate(self.row_keys)}
+            self._load_more_rows()
+
+    def _append_rows(self, rows: list[tuple[str, tuple]]) -> None:
+        """Add rows to the end of the current listing."""
+        if self.table is None:
+            return
+        self._table_rows.extend(rows)
+        start = len(self.row_keys)
+        self.row_keys.extend(key for key, _ in rows)
+        self._row_index.update((key, start + i) for i, (key, _) in enumerate(rows))
+        # Keep filling the first page; later rows wait for scrolling.
+        if self.table.row_count < self._page_size():
+            self._load_more_rows()
+
+    def _page_size(self) -> int:
+        return max(self.table.size.height, 50) * 2
+
+    def _load_more_rows(self, upto: int = 0) -> None:
+        """Materialize the next page of rows, and at least through ``upto``."""
+        if self.table is None:
+            return
+        loaded = self.table.row_count
+        if loaded >= len(self._table_rows):
+            return
+        end = max(loaded + self._page_size(), upto + 1)
+        add_row = self.table.add_row
+        with self.batch_update():
+            for key, cells in self._table_rows[loaded:end]:
+                add_row(*cells, key=key)
+
+    def _on_files_scrolled(self, scroll_y: float) -> None:
+        if self.table is None:
+            return
+        bottom = scroll_y + self.table.size.height
+        if bottom >= self.table.row_count - _TABLE_BUFFER:
+            self._load_more_rows()
+
+    @on(DataTable.RowHighlighted, "#files")
+    def _on_files_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        if event.cursor_row >= self.table.row_count - _TABLE_BUFFER:
+            self._load_more_rows()
+
     def action_refresh(self) -> None:
+        self._remote_list_cache.clear()
         # Trigger fresh discovery and liveness checks for all box sections
         self._discover_public_boxes()
         self._check_connected_box_liveness()
@@ -1234,46 +1731,77 @@ class ShadowBoxApp(App):
             if lv is not None and lv is not active_list:
                 lv.index = None
 
+    @staticmethod
+    def _is_remote_entry(data) -> bool:
+        return isinstance(data, dict) and data.get("type") in ("remote", "public")
+
+    def _active_entry_key(self) -> Optional[str]:
+        if self.active_remote_box is not None:
+            return self.active_remote_box.get("code")
+        box = self.ctx.active_box
+        return box.box_id if box is not None else None
+
+    def _activate_entry(self, data) -> bool:
+        """Make a sidebar entry the active box; return False if it already was."""
+        remote = self._is_remote_entry(data)
+        key = data.get("code") if remote else data.box_id
+        if key == self._active_entry_key():
+            return False
+        if remote:
+            self.active_remote_box = data
+            # Code-based connections (remote) assume write access, public boxes are read-only
+            # Server will enforce actual permissions - show alert on failure
+            default_perm = "write" if data.get("type") == "remote" else "read"
+            self.active_box_permission = data.get("permission", default_perm)
+        else:
+            # Local box - clear remote selection
+            self.active_remote_box = None
+            self.ctx.active_box = data
+            self.active_box_permission = self._get_box_permission(data)
+        return True
+
+    def _cancel_highlight_refresh(self) -> bool:
+        timer, self._highlight_timer = self._highlight_timer, None
+        if timer is None:
+            return False
+        timer.stop()
+        return True
+
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         data = getattr(event.item, "data", None)
         if not data:
             return
         # Clear selection in other lists for mutual exclusivity
         self._clear_other_list_selections(event.list_view)
+        self._cancel_highlight_refresh()
+        self._activate_entry(data)
         # Remote/public box - show its files via network
-        if isinstance(data, dict) and data.get("type") in ("remote", "public"):
-            self.active_remote_box = data
-            # Code-based connections (remote) assume write access, public boxes are read-only
-            # Server will enforce actual permissions - show alert on failure
-            default_perm = "write" if data.get("type") == "remote" else "read"
-            self.active_box_permission = data.get("permission", default_perm)
+        if self._is_remote_entry(data):
             self._show_remote_box_files(data, show_modal=False)
-            return
-        # Local box - clear remote selection
-        self.active_remote_box = None
-        self.ctx.active_box = data
-        self.active_box_permission = self._get_box_permission(data)
-        self.refresh_files()
+        else:
+            # Always reload, even for the active box: selecting it again is
+            # how the user leaves a tag filter or live-search listing.
+            self.refresh_files(background=True)
 
     def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
         data = getattr(event.item, "data", None)
-        if not data:
+        # Events for rows removed since they were posted are stale.
+        if not data or event.item.parent is None:
             return
         # Clear selection in other lists for mutual exclusivity
         self._clear_other_list_selections(event.list_view)
+        if not self._activate_entry(data):
+            return
         # Remote/public boxes - track selection but don't fetch on highlight
-        if isinstance(data, dict) and data.get("type") in ("remote", "public"):
-            self.active_remote_box = data
-            # Code-based connections (remote) assume write access, public boxes are read-only
-            default_perm = "write" if data.get("type") == "remote" else "read"
-            self.active_box_permission = data.get("permission", default_perm)
+        if self._is_remote_entry(data):
             return
-        # Local box - clear remote selection
-        self.active_remote_box = None
-        if data != self.ctx.active_box:
-            self.ctx.active_box = data
-            self.active_box_permission = self._get_box_permission(data)
-            self.refresh_files()
+        # Debounce so arrow-key runs through the list refresh only once
+        self._cancel_highlight_refresh()
+        self._highlight_timer = self.set_timer(0.05, self._highlight_refresh)
+
+    def _highlight_refresh(self) -> None:
+        self._highlight_timer = None
+        self.refresh_files(background=True)
 
     def _show_remote_box_files(
         self, remote_info: dict, show_modal: bool = False
@@ -1287,50 +1815,155 @@ class ShadowBoxApp(App):
         ip = remote_info["ip"]
         port = remote_info["port"]
         code = remote_info["code"]
+        cached = self._remote_list_cache.get((ip, port))
+        if cached and time.monotonic() - cached[0] < _REMOTE_LIST_TTL:
+            files = cached[1]
+            self._populate_remote_files(files)
+            if show_modal:
+                self.push_screen(
+                    ConnectSuccessModal(
+                        code=code,
+                        ip=ip,
+                        port=port,
+                        files_preview=self._remote_files_preview(files),
+                    )
+                )
+            return
         self._set_status(f"Fetching files from {code}...")
         self.run_worker(
-            lambda: self._fetch_remote_files_worker(ip, port, code, show_modal),
+            self._fetch_remote_files_async(ip, port, code, show_modal),
             name="fetch_remote_files_worker",
+            group="remote_list",
             exclusive=True,
-            thread=True,
         )
 
-    def _fetch_remote_files_worker(
+    async def _fetch_remote_files_async(
         self, ip: str, port: int, code: str, show_modal: bool = False
-    ) -> dict:
-        """Worker that fetches remote files (runs in thread)."""
+    ) -> Optional[dict]:
+        """Worker that fetches remote files (runs on the app's event loop).
+
+        The listing is streamed and each batch is shown as soon as it is
+        parsed, so large boxes start appearing before the download ends.
+        """
+        files: list[dict] = []
+        preview = ""
         try:
-            res = connect_and_request(ip, port, "LIST", timeout=5)
-            files_text = (
-                res.get("text", "").strip() if isinstance(res, dict) else str(res)
-            )
+            batches = self._stream_remote_files(ip, port, timeout=5)
+            async with aclosing(batches):
+                async for batch in batches:
+                    active = self.active_remote_box
+                    if active is None or active.get("code") != code:
+                        # User moved to another box mid-stream.
+                        return None
+                    if files:
+                        self._append_rows(self._remote_rows(batch))
+                    else:
+                        preview = self._remote_files_preview(batch)
+                        self._populate_remote_files(batch)
+                    files.extend(batch)
+            if not files:
+                self._populate_remote_files(files)
+            now = time.monotonic()
+            self._remote_list_cache[(ip, port)] = (now, files)
+            self._last_seen[code] = now
             return {
                 "success": True,
                 "code": code,
                 "ip": ip,
                 "port": port,
-                "files_text": files_text,
-                "files_preview": files_text[:500] if files_text else "(empty)",
+                "count": len(files),
+                "files_preview": preview or "(empty)",
                 "show_modal": show_modal,
             }
         except Exception as exc:
             return {"success": False, "code": code, "error": str(exc)}
 
+    def _list_remote_files(self, ip: str, port: int, timeout: float = 10) -> list[dict]:
+        """Fetch a remote box listing, preferring the JSON wire format.
+
+        Falls back to the text LIST format for servers that do not know
+        LIST JSON (they answer with an ERROR line).
+        """
+        from shadowbox.network.client import connect_and_request
+
+        res = connect_and_request(ip, port, "LIST JSON", timeout=timeout)
+        text = res.get("text", "").strip() if isinstance(res, dict) else str(res)
+        if text.startswith("["):
+            try:
+                return json.loads(text)
+            except ValueError:
+                pass
+        elif text.startswith("ERROR"):
+            res = connect_and_request(ip, port, "LIST", timeout=timeout)
+            text = res.get("text", "").strip() if isinstance(res, dict) else str(res)
+        return self._parse_remote_files(text)
+
+    async def _stream_remote_files(
+        self, ip: str, port: int, timeout: float = 10
+    ) -> AsyncIterator[list[dict]]:
+        """Yield a remote box listing in parsed batches as lines arrive.
+
+        Uses LIST JSON (one entry per line) and falls back to the text LIST
+        format for servers that answer it with an ERROR line.
+        """
+        from shadowbox.network.client import iter_lines_async
+
+        batch: list[dict] = []
+        for request in ("LIST JSON", "LIST"):
+            mode = None
+            lines = iter_lines_async(ip, port, request, timeout=timeout)
+            async with aclosing(lines):
+                async for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    if mode is None:
+                        if request == "LIST JSON" and line.startswith("ERROR"):
+                            mode = "unsupported"
+                            break
+                        mode = "json" if line.startswith("[") else "text"
+                        if line == "[":
+                            continue
+                    if mode == "json":
+                        line = line.rstrip(",")
+                        if line == "]":
+                            continue
+                        # One entry per line, or the whole array on one line
+                        try:
+                            parsed = json.loads(line)
+                        except ValueError:
+                            # Skip a malformed entry rather than the listing
+                            continue
+                        batch.extend(parsed if isinstance(parsed, list) else [parsed])
+                    else:
+                        batch.extend(self._parse_remote_files(line.rstrip(",")))
+                    if len(batch) >= _REMOTE_BATCH:
+                        yield batch
+                        batch = []
+            if mode != "unsupported":
+                break
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _remote_files_preview(files: list[dict]) -> str:
+        preview = "\n".join(f["filename"] for f in files)
+        return preview[:500] if preview else "(empty)"
+
     def _parse_remote_files(self, files_text: str) -> list[dict]:
         """Parse remote file list from backend format.
 
         New format: file_id: {Filename: name, Size: 123, Tags: ['tag1'], Status: active}
         Returns list of dicts with keys: file_id, filename, size, tags, status
         """
-        import re
-
         files: list[dict] = []
         if not files_text:
             return files
 
         # New format uses ",\n" as separator, old format uses just "\n"
-        # Try to detect format: if we see "{" it's likely new format
-        if "{" in files_text:
+        # Detect format from the first entry only: "{" there means new format
+        first_end = files_text.find("\n")
+        if files_text.find("{", 0, first_end if first_end != -1 else len(files_text)) != -1:
             entries = files_text.split(",\n")
         else:
             entries = files_text.split("\n")
@@ -1341,7 +1974,7 @@ class ShadowBoxApp(App):
                 continue
 
             # Try to parse new format: "file_id: {Filename: ..., Size: ..., Tags: ..., Status: ...}"
-            match = re.match(r"^([^:]+):\s*\{(.+)\}$", entry)
+            match = _RE_ENTRY.match(entry)
             if match:
                 file_id = match.group(1).strip()
                 props_str = match.group(2)
@@ -1354,30 +1987,31 @@ class ShadowBoxApp(App):
                 modified_at = ""
 
                 # Parse Filename
-                fn_match = re.search(r"Filename:\s*([^,]+?)(?:,|$)", props_str)
+                fn_match = _RE_FN.search(props_str)
                 if fn_match:
                     filename = fn_match.group(1).strip()
 
-                # Parse Size
-                size_match = re.search(r"Size:\s*(\d+)", props_str)
-                if size_match:
-                    size = int(size_match.group(1))
+                # Parse Size - plain str ops, no regex needed for a numeric field
+                _, _, rest = props_str.partition("Size:")
+                digits = rest.split(",", 1)[0].strip()
+                if digits.isdigit():
+                    size = int(digits)
 
                 # Parse Tags - format is Tags: ['tag1', 'tag2'] or Tags: []
-                tags_match = re.search(r"Tags:\s*\[([^\]]*)\]", props_str)
+                tags_match = _RE_TAGS.search(props_str)
                 if tags_match:
                     tags_content = tags_match.group(1).strip()
                     if tags_content:
                         # Extract quoted strings
-                        tags = re.findall(r"'([^']*)'", tags_content)
+                        tags = _RE_TAG.findall(tags_content)
 
                 # Parse Status
-                status_match = re.search(r"Status:\s*(\w+)", props_str)
+                status_match = _RE_STATUS.search(props_str)
                 if status_match:
                     status = status_match.group(1).strip()
 
                 # Parse Modified - format is Modified: 2024-01-15T10:30:00 or datetime object str
-                modified_match = re.search(r"Modified:\s*([^,}]+)", props_str)
+                modified_match = _RE_MOD.search(props_str)
                 if modified_match:
                     modified_at = modified_match.group(1).strip()
 
@@ -1437,10 +2071,14 @@ class ShadowBoxApp(App):
         """Populate the table with remote file entries."""
         if self.table is None:
             return
-        self.table.clear(columns=False)
-        self.row_keys = []
         self.viewing_remote = True
+        self._fill_table(self._remote_rows(files))
+
+        self._set_status(f"Remote box: {len(files)} file(s)")
 
+    @staticmethod
+    def _remote_rows(files: list[dict]) -> list[tuple[str, tuple]]:
+        rows = []
         for f in files:
             tags_str = ", ".join(f["tags"]) if f["tags"] else "--"
             # Format modified_at - truncate datetime to just date+time if it's an ISO string
@@ -1453,17 +2091,19 @@ class ShadowBoxApp(App):
                 modified_str = modified_str.replace("T", " ")
             else:
                 modified_str = "--"
-            self.table.add_row(
-                f["filename"],
-                _human_size(f["size"]),
-                tags_str,
-                f["status"],
-                modified_str,
-                key=f["file_id"],
+            rows.append(
+                (
+                    f["file_id"],
+                    (
+                        f["filename"],
+                        _human_size(f["size"]),
+                        tags_str,
+                        f["status"],
+                        modified_str,
+                    ),
+                )
             )
-            self.row_keys.append(f["file_id"])
-
-        self._set_status(f"Remote box: {len(files)} file(s)")
+        return rows
 
     def _set_status(self, message: str) -> None:
         if self.status:
@@ -1473,12 +2113,15 @@ class ShadowBoxApp(App):
         """Get the current user's permission level for a box."""
         if box.user_id == self.ctx.user.user_id:
             return "owner"
-        # Check share permission from database
-        shares = self.ctx.fm.box_share_model.list_by_box(box.box_id)
-        for share in shares:
-            if share["shared_with_user_id"] == self.ctx.user.user_id:
-                return share["permission_level"]
-        return "read"  # Default fallback
+        # Check share permission, loading all of the user's shares at once
+        if self._perm_cache is None:
+            user_id = self.ctx.user.user_id
+            self._perm_cache = {
+                share["box_id"]: share["permission_level"]
+                for share in self.ctx.fm.box_share_model.list_by_user(user_id)
+                if share["shared_with_user_id"] == user_id
+            }
+        return self._perm_cache.get(box.box_id, "read")  # Default fallback
 
     def _has_write_permission(self) -> bool:
         """Check if current user has write permission on active box.
@@ -1490,19 +2133,25 @@ class ShadowBoxApp(App):
         return self.active_box_permission in ("owner", "admin", "write")
 
     def _update_status(self) -> None:
-        # pull fresh user quota for accuracy
-        row = self.ctx.fm.user_model.get(self.ctx.user.user_id)
-        if row:
-            self.ctx.user.used_bytes = row.get("used_bytes", self.ctx.user.used_bytes)
-            self.ctx.user.quota_bytes = row.get(
-                "quota_bytes", self.ctx.user.quota_bytes
-            )
+        # pull fresh user quota after anything that may have changed it
+        now = time.monotonic()
+        if self._user_row_dirty or now - self._user_row_at > _USER_ROW_TTL:
+            row = self.ctx.fm.user_model.get(self.ctx.user.user_id)
+            if row:
+                self.ctx.user.used_bytes = row.get(
+                    "used_bytes", self.ctx.user.used_bytes
+                )
+                self.ctx.user.quota_bytes = row.get(
+                    "quota_bytes", self.ctx.user.quota_bytes
+                )
+            self._user_row_dirty = False
+            self._user_row_at = now
         used = _human_size(self.ctx.user.used_bytes)
         total = _human_size(self.ctx.user.quota_bytes)
         box_name = self.ctx.active_box.box_name if self.ctx.active_box else "(none)"
         perm_display = self.active_box_permission.upper()
         self._set_status(
-            f"User: {self.ctx.user.username} • Box: {box_name} [{perm_display}] • Files: {self.table.row_count} • Quota: {used}/{total}"
+            f"User: {self.ctx.user.username} • Box: {box_name} [{perm_display}] • Files: {len(self.row_keys)} • Quota: {used}/{total}"
         )
 
     # === Actions ===
@@ -1529,11 +2178,22 @@ class ShadowBoxApp(App):
         if self.active_remote_box is not None:
             ip = self.active_remote_box["ip"]
             port = self.active_remote_box["port"]
+            path = os.path.expanduser(result.path)
+            if os.path.isdir(path):
+                # A folder uploads each file in it, several at a time
+                with os.scandir(path) as it:
+                    paths = sorted(entry.path for entry in it if entry.is_file())
+                self._set_status(f"Uploading {len(paths)} file(s) to remote...")
+                self.run_worker(
+                    lambda: self._remote_batch_upload_worker(ip, port, paths),
+                    name="remote_batch_upload_worker",
+                    thread=True,
+                )
+                return
             self._set_status("Uploading to remote...")
             self.run_worker(
                 lambda: self._remote_upload_worker(ip, port, result.path),
                 name="remote_upload_worker",
-                exclusive=True,
                 thread=True,
             )
             return
@@ -1546,6 +2206,7 @@ class ShadowBoxApp(App):
                 tags=result.tags,
                 encrypt=result.encrypt,
             )
+            self._user_row_dirty = True
             self.refresh_files()
             self._set_status("Added file")
         except Exception as exc:  # pragma: no cover - UI-only
@@ -1572,12 +2233,12 @@ class ShadowBoxApp(App):
                 return
             filename = self.table.get_row_at(self.table.cursor_row)[0]
             self.push_screen(
-                DownloadModal(),
+                self._modal(DownloadModal),
                 lambda res: self._handle_remote_download(res, filename),
             )
         else:
             self.push_screen(
-                DownloadModal(),
+                self._modal(DownloadModal),
                 lambda res: self._handle_download(res, file_id),
             )
 
@@ -1603,7 +2264,6 @@ class ShadowBoxApp(App):
         self.run_worker(
             lambda: self._remote_download_worker(ip, port, filename, result.dest),
             name="remote_download_worker",
-            exclusive=True,
             thread=True,
         )
 
@@ -1611,17 +2271,23 @@ class ShadowBoxApp(App):
         self, ip: str, port: int, filename: str, dest_path: str
     ) -> dict:
         """Worker that downloads a file from a remote box."""
+        from shadowbox.network.client import connect_and_request
+
+        # Download next to the destination and rename on success, so a failed
+        # transfer never truncates or replaces an existing file.
+        part_path = dest_path + ".part"
         try:
-            # Stream bytes to dest path using network client's file mode
+            # Stream bytes to the part file using network client's file mode
             res = connect_and_request(
                 ip,
                 port,
                 f"GET {filename}",
                 recv_file=True,
-                out_path=dest_path,
+                out_path=part_path,
                 timeout=30,
             )
             if isinstance(res, dict) and res.get("status") == "ok":
+                os.replace(part_path, dest_path)
                 return {"success": True, "dest": dest_path, "filename": filename}
             else:
                 error = (
@@ -1629,12 +2295,17 @@ class ShadowBoxApp(App):
                     if isinstance(res, dict)
                     else str(res)
                 )
-                return {"success": False, "error": error}
+                return {"success": False, "error": error.replace(part_path, dest_path)}
         except Exception as exc:
             return {"success": False, "error": str(exc)}
+        finally:
+            with suppress(FileNotFoundError):
+                os.remove(part_path)
 
     def _remote_upload_worker(self, ip: str, port: int, local_path: str) -> dict:
         """Worker that uploads a file to a remote box."""
+        from shadowbox.network.client import cmd_put
+
         try:
             res = cmd_put(ip, port, local_path, timeout=60)
             if isinstance(res, dict) and res.get("status") == "ok":
@@ -1649,13 +2320,28 @@ class ShadowBoxApp(App):
         except Exception as exc:
             return {"success": False, "error": str(exc)}
 
+    def _remote_batch_upload_worker(self, ip: str, port: int, paths: list[str]) -> dict:
+        """Worker that uploads several files to a remote box concurrently."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not paths:
+            return {"results": []}
+        workers = min(_REMOTE_TRANSFER_WORKERS, len(paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(lambda p: self._remote_upload_worker(ip, port, p), paths)
+            )
+        return {"results": results}
+
     def _remote_delete_worker(self, ip: str, port: int, filename: str) -> dict:
         """Worker that deletes a file from a remote box."""
+        from shadowbox.network.client import cmd_delete
+
         try:
             res = cmd_delete(ip, port, filename, timeout=30)
             if isinstance(res, dict) and res.get("status") == "ok":
                 text = res.get("text", "")
-                if "ERROR" in text.upper():
+                if _RE_ERROR.search(text):
                     return {"success": False, "error": text}
                 return {"success": True, "filename": filename}
             else:
@@ -1698,7 +2384,6 @@ class ShadowBoxApp(App):
             self.run_worker(
                 lambda: self._remote_delete_worker(ip, port, filename),
                 name="remote_delete_worker",
-                exclusive=True,
                 thread=True,
             )
             return
@@ -1706,6 +2391,8 @@ class ShadowBoxApp(App):
         try:
             self._set_status("Deleting...")
             self.ctx.fm.delete_file(file_id, soft=True)
+            self._row_cache.pop(file_id, None)
+            self._user_row_dirty = True
             self.refresh_files()
             self._set_status("Deleted file")
         except Exception as exc:  # pragma: no cover - UI-only
@@ -1723,13 +2410,13 @@ class ShadowBoxApp(App):
             target_box = next((b for b in all_boxes if b.box_id == result.box_id), None)
             if target_box:
                 self.ctx.active_box = target_box
-                self.refresh_boxes()
+                self.refresh_boxes(all_boxes)
                 self.refresh_files()
                 # Find and select the file in the table
-                for idx, fid in enumerate(self.row_keys):
-                    if fid == result.file_id:
-                        self.table.move_cursor(row=idx)
-                        break
+                idx = self._row_index.get(result.file_id)
+                if idx is not None:
+                    self._load_more_rows(upto=idx)
+                    self.table.move_cursor(row=idx)
                 self._set_status(f"Jumped to {target_box.box_name}")
         except Exception as exc:
             self._set_status(f"Jump failed: {exc}")
@@ -1738,7 +2425,7 @@ class ShadowBoxApp(App):
         """
         Ask the user for a tag name and filter files by that tag.
         """
-        self.push_screen(TagSearchModal(), self._handle_filter_by_tag)
+        self.push_screen(self._modal(TagSearchModal), self._handle_filter_by_tag)
 
     def _search_accessible_by_tag(self, tag: str, box_id: str | None = None, limit: int = 200):
         """Search files by tag in all accessible boxes (owned + shared).
@@ -1751,40 +2438,16 @@ class ShadowBoxApp(App):
             return []
         
         user_id = self.ctx.user.user_id
-        
-        sql = """
-            SELECT DISTINCT f.*
-            FROM files f
-            JOIN tags t ON t.entity_type = 'file' AND t.entity_id = f.file_id
-            JOIN boxes b ON f.box_id = b.box_id
-            LEFT JOIN box_shares bs 
-                ON bs.box_id = b.box_id 
-                AND bs.shared_with_user_id = ?
-            WHERE t.tag_name = ?
-              AND f.status != 'deleted'
-              AND (
-                  b.user_id = ? 
-                  OR (
-                      bs.share_id IS NOT NULL 
-                      AND (bs.expires_at IS NULL OR bs.expires_at > CURRENT_TIMESTAMP)
-                  )
-              )
-        """
-        params: list = [user_id, tag, user_id]
-        
         if box_id:
-            sql += " AND f.box_id = ?"
-            params.append(box_id)
-        
-        sql += " ORDER BY f.created_at DESC LIMIT ?"
-        params.append(limit)
-        
-        rows = self.ctx.db.fetch_all(sql, tuple(params))
+            rows = self.ctx.db.fetch_all(_TAG_SQL_BOX, (user_id, tag, user_id, box_id, limit))
+        else:
+            rows = self.ctx.db.fetch_all(_TAG_SQL_ALL, (user_id, tag, user_id, limit))
         
         # Convert rows to FileMetadata with tags
-        file_ids = [r["file_id"] for r in rows]
-        tm = tags_map(self.ctx.db, file_ids)
-        return [row_to_metadata(r, tm.get(r["file_id"], [])) for r in rows]
+        return [
+            row_to_metadata(r, r["all_tags"].split(_TAG_SEP) if r["all_tags"] else [])
+            for r in rows
+        ]
 
     def _handle_filter_by_tag(self, tag):
         """
@@ -1806,29 +2469,22 @@ class ShadowBoxApp(App):
             self._set_status("Tag search failed: %s" % exc)
             return
 
-        self.table.clear(columns=False)
-        self.row_keys = []
-
-        for f in hits:
-            tags_text = ", ".join(f.tags) if getattr(f, "tags", None) else "--"
-            status = f.status.value if hasattr(f.status, "value") else str(f.status)
-            if hasattr(f, "modified_at"):
-                try:
-                    modified = f.modified_at.isoformat(timespec="seconds")
-                except Exception:
-                    modified = str(f.modified_at)
-            else:
-                modified = ""
-
-            self.table.add_row(
-                f.filename,
-                _human_size(getattr(f, "size", 0)),
-                tags_text,
-                status,
-                modified,
-                key=f.file_id,
+        # hits are FileMetadata from row_to_metadata; _fill_table adds them
+        # inside one batch_update.
+        rows = [
+            (
+                f.file_id,
+                (
+                    f.filename,
+                    _human_size(f.size),
+                    ", ".join(f.tags) if f.tags else "--",
+                    f.status.value,
+                    _fmt_modified(f.modified_at),
+                ),
             )
-            self.row_keys.append(f.file_id)
+            for f in hits
+        ]
+        self._fill_table(rows)
 
         self._set_status("Tag '%s': %d result(s)" % (tag, len(hits)))
 
@@ -1851,6 +2507,7 @@ class ShadowBoxApp(App):
                 description=result.description or None,
                 enable_encryption=result.encrypt,
             )
+            self.ctx.invalidate_boxes()
             self.refresh_boxes()
             self.ctx.active_box = box
             self.refresh_files()
@@ -1899,11 +2556,13 @@ class ShadowBoxApp(App):
             return
         try:
             self.ctx.fm.delete_box(self.ctx.active_box.box_id)
+            self.ctx.invalidate_boxes()
+            self._user_row_dirty = True
             boxes = self.ctx.fm.list_user_boxes(self.ctx.user.user_id)
             self.ctx.active_box = None
             if boxes:
                 self.ctx.active_box = boxes[0]
-            self.refresh_boxes()
+            self.refresh_boxes(boxes)
             self.refresh_files()
             msg = "Box deleted"
             if not self.ctx.active_box:
@@ -1943,12 +2602,9 @@ class ShadowBoxApp(App):
         if self.active_shares:
             # Get the name of the currently shared box
             current_box_id = next(iter(self.active_shares.keys()))
-            current_box_name = None
-            for box in self.ctx.fm.list_user_boxes(self.ctx.user.user_id):
-                if box.box_id == current_box_id:
-                    current_box_name = box.box_name
-                    break
-            current_box_name = current_box_name or "Unknown"
+            # The sidebar already holds every owned box; no need to query them again.
+            entry = self._box_items.get(current_box_id)
+            current_box_name = entry[0].data.box_name if entry else "Unknown"
             self.push_screen(
                 ReplaceShareConfirmModal(current_box_name, self.ctx.active_box.box_name),
                 self._handle_replace_share_confirm,
@@ -1978,12 +2634,14 @@ class ShadowBoxApp(App):
         box_name = self.ctx.active_box.box_name
         username = self.ctx.user.username
         self.pending_shares.add(box_id)
+        self._shares_changed()
         self.refresh_boxes()
 
         # Run the blocking mDNS work in a background thread
         self.run_worker(
             lambda: self._do_share_worker(box_id, box_name, result, username),
             name="share_worker",
+            group="share",
             exclusive=True,
             thread=True,
         )
@@ -1992,6 +2650,15 @@ class ShadowBoxApp(App):
         self, box_id: str, box_name: str, result: "ShareBoxResult", username: str
     ) -> dict:
         """Worker that does the actual server startup and mDNS registration (runs in thread)."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from shadowbox.network.adapter import init_env, select_box
+        from shadowbox.network.server import (
+            advertise_service,
+            give_code,
+            start_tcp_server,
+        )
+
         try:
             # Generate 4-letter code for private, empty for public (uses base service type)
             if result.is_public:
@@ -2020,57 +2687,67 @@ class ShadowBoxApp(App):
             )
             select_box(env, box_name)
 
-            # Create share records for each write user BEFORE starting server
-            # short TTL (10s), will extend while share is active
-            # If host crashes, shares auto-expire without manual cleanup
-            share_errors = []
-            granted_user_ids: set[str] = set()
-            bsm = BoxShareModel(env["db"])
-            bm = BoxModel(env["db"])
-            
-            for write_user in result.write_usernames:
-                try:
-                    # Create user if doesn't exist by calling init_env with their username
-                    user_env = init_env(
-                        db_path=db_path, storage_root=storage_root, username=write_user
-                    )
-                    
-                    # Delete any existing share first (to update expiration)
-                    bsm.delete_by_box_and_user(env["box_id"], user_env["user_id"])
-                    
-                    # Create share with 10-second TTL
-                    share = BoxShare(
-                        box_id=env["box_id"],
-                        shared_by_user_id=env["user_id"],
-                        shared_with_user_id=user_env["user_id"],
-                        permission_level="write",
-                        expires_at=datetime.utcnow() + timedelta(seconds=10),
-                    )
-                    bsm.create(share)
-                    bm.set_shared(env["box_id"], True)
-                    
-                    # Track for extension
-                    granted_user_ids.add(user_env["user_id"])
-                except Exception as e:
-                    share_errors.append(f"{write_user}: {e}")
-
-            context = {"mode": "core", "env": env}
-
-            # Advertise the service
+            # Advertise the service; mDNS probing takes a while, so let it run
+            # while the share records below are written
             server_name = (
                 f"FileServer-{username}" if result.is_public else f"FileServer-{code}"
             )
-            zeroconf, info = advertise_service(server_name, 9999, service_type)
-
-            # Create stop event for this server
-            server_stop_event = threading.Event()
-
-            # Start TCP server in a daemon thread
-            def run_server():
-                start_tcp_server(context, 9999)
-
-            server_thread = threading.Thread(target=run_server, daemon=True)
-            server_thread.start()
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                advertised = ex.submit(advertise_service, server_name, 9999, service_type)
+                started = False
+                try:
+                    # Create share records for each write user BEFORE starting server
+                    # short TTL (10s), will extend while share is active
+                    # If host crashes, shares auto-expire without manual cleanup
+                    share_errors = []
+                    granted_user_ids: set[str] = set()
+                    bsm = BoxShareModel(env["db"])
+                    bm = BoxModel(env["db"])
+
+                    share_users = list(dict.fromkeys(result.write_usernames))
+                    if share_users:
+                        expires_at = datetime.utcnow() + timedelta(seconds=10)
+                        try:
+                            # Create users that don't exist yet, then replace any existing
+                            # shares (to update expiration) with 10-second TTL ones
+                            user_ids = UserModel(env["db"]).ensure_usernames(share_users)
+                            shares = [
+                                BoxShare(
+                                    box_id=env["box_id"],
+                                    shared_by_user_id=env["user_id"],
+                                    shared_with_user_id=user_ids[write_user],
+                                    permission_level="write",
+                                    expires_at=expires_at,
+                                )
+                                for write_user in share_users
+                            ]
+                            bsm.replace_many(shares)
+                            bm.set_shared(env["box_id"], True)
+                        except Exception as e:
+                            share_errors.extend(f"{u}: {e}" for u in share_users)
+                        else:
+                            # Track for extension
+                            granted_user_ids.update(s.shared_with_user_id for s in shares)
+
+                    context = {"mode": "core", "env": env}
+
+                    zeroconf, info = advertised.result()
+
+                    # Create stop event for this server
+                    server_stop_event = threading.Event()
+
+                    # Start TCP server in a daemon thread
+                    def run_server():
+                        start_tcp_server(context, 9999)
+
+                    server_thread = threading.Thread(target=run_server, daemon=True)
+                    server_thread.start()
+
+                    started = True
+                finally:
+                    if not started:
+                        # Don't leave a failed share advertised on the LAN
+                        self._withdraw_advertisement(advertised)
 
             return {
                 "success": True,
@@ -2093,12 +2770,27 @@ class ShadowBoxApp(App):
                 "error": str(exc),
             }
 
+    @staticmethod
+    def _withdraw_advertisement(advertised) -> None:
+        """Unregister the mDNS service behind ``advertised`` once it is up."""
+        try:
+            zeroconf, info = advertised.result()
+        except Exception:
+            # Registration itself failed; there is nothing to undo
+            return
+        try:
+            zeroconf.unregister_service(info)
+        finally:
+            zeroconf.close()
+
     def _stop_sharing(self, box_id: str) -> None:
         """Stop sharing a box and cleanup mDNS registration and TCP server.
         
         Note: Database share records use TTL and will auto-expire in ~10 seconds.
         No manual cleanup needed - just stop sharing by removing from active_shares.
         """
+        from shadowbox.network.server import stop_server
+
         if box_id not in self.active_shares:
             return
         zeroconf, info, code, is_public, stop_event, _ = self.active_shares[box_id]
@@ -2113,6 +2805,7 @@ class ShadowBoxApp(App):
             pass
         
         del self.active_shares[box_id]
+        self._shares_changed()
         self.refresh_boxes()
         if is_public:
             self.notify("Stopped public sharing")
@@ -2127,17 +2820,25 @@ class ShadowBoxApp(App):
         if not result:
             return
         code = result.code
+        if code == self._connecting:
+            # Already looking this code up; don't open another browser.
+            self._set_status(f"Still searching for {code}...")
+            return
+        self._connecting = code
         self._set_status(f"Searching for {code}...")
         # Run the blocking discovery in a background thread
         self.run_worker(
             lambda: self._do_connect_worker(code),
             name="connect_worker",
+            group="connect",
             exclusive=True,
             thread=True,
         )
 
     def _do_connect_worker(self, code: str) -> dict:
         """Worker that does the actual mDNS lookup and TCP connection (runs in thread)."""
+        from shadowbox.network.client import get_server_address
+
         try:
             # Use backend API for service discovery
             result = get_server_address(code, timeout=5.0)
@@ -2148,17 +2849,15 @@ class ShadowBoxApp(App):
             ip, port = result
 
             # Try to connect and list files
-            res = connect_and_request(ip, port, "LIST")
-            files_text = (
-                res.get("text", "").strip() if isinstance(res, dict) else str(res)
-            )
+            files = self._list_remote_files(ip, port)
 
             return {
                 "success": True,
                 "code": code,
                 "ip": ip,
                 "port": port,
-                "files_preview": files_text[:500] if files_text else "(empty)",
+                "files": files,
+                "files_preview": self._remote_files_preview(files),
             }
         except Exception as exc:
             return {"success": False, "code": code, "error": str(exc)}
@@ -2194,6 +2893,7 @@ class ShadowBoxApp(App):
             meta.tags = [t.strip() for t in result.tags.split(",") if t.strip()]
             meta.description = result.description.strip() or None
             self.ctx.fm.file_model.update(meta)
+            self._row_cache.pop(meta.file_id, None)
             self.refresh_files()
             self._set_status("Updated file metadata")
         except Exception as exc:  # pragma: no cover
@@ -2231,6 +2931,8 @@ class ShadowBoxApp(App):
             if not ok:
                 self._set_status("Restore failed")
                 return
+            self._row_cache.pop(file_id, None)
+            self._user_row_dirty = True
             self.refresh_files()
             self._set_status("Restored Version")
         except Exception as exc:
@@ -2257,337 +2959,529 @@ class ShadowBoxApp(App):
         Note: Database share records use TTL and will auto-expire.
         No manual cleanup needed - if we crash, shares expire in ~10 seconds.
         """
-        for box_id in list(self.active_shares.keys()):
-            zeroconf, info, _, _, _, _ = self.active_shares[box_id]
+        from shadowbox.network.server import stop_server
+
+        if not self.active_shares:
+            return
+        # All shares run on the one TCP server; stop it once.
+        try:
+            stop_server()
+        except Exception:
+            pass
+        for zeroconf, info, _, _, _, _ in self.active_shares.values():
             try:
-                stop_server()
                 zeroconf.unregister_service(info)
                 zeroconf.close()
             except Exception:
                 pass
         self.active_shares.clear()
+        self._shares_changed()
+
+    def _schedule_share_renewal(self, box_id: str, now: float) -> None:
+        due = now + _SHARE_RENEW_EVERY
+        self._share_renew_at[box_id] = due
+        heapq.heappush(self._share_heap, (due, box_id))
 
     def _extend_share_expiration(self) -> None:
-        """extend TTL of all active session shares.
-        
-        Runs every 3 seconds to keep shares alive while host is running.
-        If host crashes, shares auto-expire after ~10 seconds.
+        """extend TTL of active session shares that are due for renewal.
+
+        Each share is renewed every 3 seconds to keep it alive while host is
+        running. If host crashes, shares auto-expire after ~10 seconds.
         """
-        if not self.active_shares:
+        heap = self._share_heap
+        now = time.monotonic()
+        if not heap or heap[0][0] > now:
             return
-        
-        new_expiry = datetime.utcnow() + timedelta(seconds=10)
-        
-        for box_id, (_, _, _, _, _, granted_user_ids) in self.active_shares.items():
-            for user_id in granted_user_ids:
-                try:
-                    self.ctx.db.execute(
-                        "UPDATE box_shares SET expires_at = ? WHERE box_id = ? AND shared_with_user_id = ?",
-                        (new_expiry.isoformat(), box_id, user_id),
-                    )
-                except Exception:
-                    # Best effort - if DB is busy, next extension will catch it
-                    pass
+
+        new_expiry = (datetime.utcnow() + timedelta(seconds=10)).isoformat()
+        rows: list[tuple[str, str, str]] = []
+
+        while heap and heap[0][0] <= now:
+            due, box_id = heapq.heappop(heap)
+            share = self.active_shares.get(box_id)
+            if share is None:
+                # Share was stopped; forget it.
+                self._share_renew_at.pop(box_id, None)
+                continue
+            if self._share_renew_at.get(box_id) != due:
+                continue  # superseded by a newer schedule
+            self._schedule_share_renewal(box_id, now)
+            rows.extend((new_expiry, box_id, user_id) for user_id in share[5])
+
+        if not rows:
+            return
+        try:
+            # one transaction (and one commit) for every share renewed this tick
+            with self.ctx.db.get_transaction_context() as cursor:
+                cursor.executemany(
+                    "UPDATE box_shares SET expires_at = ? WHERE box_id = ? AND shared_with_user_id = ?",
+                    rows,
+                )
+        except Exception:
+            # Best effort - if DB is busy, next extension will catch it
+            pass
+
+    def _tick(self) -> None:
+        """Single 1-second timer driving all periodic background work."""
+        self._tick_n += 1
+        n = self._tick_n
+        with self.batch_update():
+            # publish public box changes from the mDNS browser
+            self._sync_public_boxes()
+            # extend share TTLs that are due (shares expire after 10s without)
+            self._extend_share_expiration()
+            # Check connected box liveness every 30 seconds
+            if n % 30 == 0:
+                self._check_connected_box_liveness()
+                self._save_peers()
 
     def _discover_public_boxes(self) -> None:
-        """Background discovery for public boxes on LAN (non-blocking)."""
-        # Use run_worker to avoid blocking the UI
+        """Start the background public box browser, or publish its current state."""
+        if self._zeroconf is None:
+            self.run_worker(
+                self._start_public_browser(),
+                name="_start_public_browser",
+                group="discovery",
+                exclusive=True,
+            )
+            return
+        self._public_dirty = True
+        self._sync_public_boxes()
+
+    async def _start_public_browser(self) -> None:
+        """Create the AsyncZeroconf browser on the app's event loop."""
+        from zeroconf.asyncio import AsyncServiceBrowser, AsyncZeroconf
+
+        try:
+            self._zeroconf = AsyncZeroconf()
+            self._public_browser = AsyncServiceBrowser(
+                self._zeroconf.zeroconf,
+                _PUBLIC_SERVICE_TYPE,
+                handlers=[self._on_public_service_change],
+            )
+        except Exception:
+            self._zeroconf = None
+            self._public_browser = None
+
+    def _on_public_service_change(self, zeroconf, service_type, name, state_change) -> None:
+        """ServiceBrowser callback (runs on the event loop)."""
+        from zeroconf import ServiceStateChange
+
+        if state_change is ServiceStateChange.Removed:
+            if self._live_public.pop(name, None) is not None:
+                self._public_dirty = True
+            return
         self.run_worker(
-            self._discover_public_boxes_worker,
-            name="_discover_public_boxes_worker",
-            exclusive=True,
-            thread=True,
+            self._resolve_public_service(zeroconf, service_type, name),
+            group="discovery",
         )
 
-    def _discover_public_boxes_worker(self) -> dict[str, dict]:
-        """Worker that does the actual discovery (runs in thread)."""
-        import socket
-        import time
+    async def _resolve_public_service(self, zeroconf, service_type: str, name: str) -> None:
+        from zeroconf import IPVersion
+        from zeroconf.asyncio import AsyncServiceInfo
+
+        info = AsyncServiceInfo(service_type, name)
+        if not await info.async_request(zeroconf, 1000):
+            return
+        addresses = info.parsed_addresses(IPVersion.V4Only)
+        if not addresses:
+            return
+        # All services on base _shadowbox._tcp.local. are public
+        # Extract username from "FileServer-{username}._shadowbox._tcp.local."
+        owner = name.split(".")[0].replace("FileServer-", "")
+        entry = {"name": owner, "ip": addresses[0], "port": info.port}
+        if self._live_public.get(name) != entry:
+            self._live_public[name] = entry
+            self._public_dirty = True
+
+    def _sync_public_boxes(self) -> None:
+        """Publish browser results to the sidebar if anything changed."""
+        if not self._public_dirty:
+            return
+        self._public_dirty = False
+        self._apply_public_discovery(dict(self._live_public))
+
+    def _apply_public_discovery(self, new_discovered: dict[str, dict]) -> None:
+        # Browser updates often re-announce the same services.
+        if new_discovered == self.discovered_public:
+            return
+        # Check if active public box is no longer available
+        if (
+            self.active_remote_box
+            and self.active_remote_box.get("type") == "public"
+        ):
+            active_code = self.active_remote_box.get("code")
+            if active_code and active_code not in new_discovered:
+                self.active_remote_box = None
+                self.viewing_remote = False
+                self.refresh_files()
+                self.notify("Public box is no longer available", severity="warning")
+
+        # Cross-reference: remove connected boxes whose IP now has a different/public share
+        # This handles the case where sharer stopped and reshared with a new code
+        # Same IP is now advertising a (possibly different) public share
+        # The old code-based connection is stale
+        stale_connected: set[str] = set()
+        if self.connected_boxes:
+            discovered_ips = {info["ip"] for info in new_discovered.values()}
+            stale_connected = {
+                code
+                for code, info in self.connected_boxes.items()
+                if info["ip"] in discovered_ips
+            }
+        if stale_connected:
+            self._drop_connected_boxes(stale_connected, "reshared")
 
-        from zeroconf import ServiceBrowser, ServiceListener, Zeroconf
+        self.discovered_public = new_discovered
+        self._refresh_public_boxes()
 
-        discovered: dict[str, dict] = {}
-        base_service_type = "_shadowbox._tcp.local."
+    def _drop_connected_boxes(self, codes: set[str], reason: str) -> None:
+        """Forget the given code connections and leave their view if open.
 
-        try:
-            zc = Zeroconf()
-
-            class Listener(ServiceListener):
-                def add_service(
-                    self, zeroconf: Zeroconf, type_: str, name: str
-                ) -> None:
-                    # All services on base _shadowbox._tcp.local. are public
-                    info = zeroconf.get_service_info(type_, name, timeout=1000)
-                    if info and info.addresses:
-                        ip = None
-                        for packed in info.addresses:
-                            if len(packed) == 4:
-                                ip = socket.inet_ntoa(packed)
-                                break
-                        if ip:
-                            # Extract username from "FileServer-{username}._shadowbox._tcp.local."
-                            owner = name.split(".")[0].replace("FileServer-", "")
-                            discovered[name] = {
-                                "name": owner,
-                                "ip": ip,
-                                "port": info.port,
-                            }
-
-                def remove_service(self, _zc: Zeroconf, _type: str, _name: str) -> None:
-                    pass
-
-                def update_service(self, _zc: Zeroconf, _type: str, _name: str) -> None:
-                    pass
-
-            listener = Listener()
-            browser = ServiceBrowser(zc, base_service_type, listener)
-            time.sleep(1.5)  # OK to block here - we're in a worker thread
-            browser.cancel()
-            zc.close()
-        except Exception:
-            pass
-        return discovered
+        The user is told about it ``_DROP_NOTICE_DELAY`` seconds later, so a
+        burst of drops (e.g. a network partition) ends up in a single toast.
+        """
+        if not self._drop_notices:
+            self.set_timer(_DROP_NOTICE_DELAY, self._flush_drop_notices)
+        self._drop_notices[reason] = self._drop_notices.get(reason, 0) + len(codes)
+        self.connected_boxes = {
+            code: info for code, info in self.connected_boxes.items() if code not in codes
+        }
+        for code in codes:
+            self._last_seen.pop(code, None)
+            self._probe_failures.pop(code, None)
+        self._peers_dirty = True
+        self.refresh_boxes()
+        # Clear file view if active box was removed
+        active = self.active_remote_box
+        if active and active.get("type") == "remote" and active.get("code") in codes:
+            self.active_remote_box = None
+            self.viewing_remote = False
+            self.refresh_files()
+
+    def _flush_drop_notices(self) -> None:
+        notices, self._drop_notices = self._drop_notices, {}
+        if not notices:
+            return
+        detail = ", ".join(f"{n} {reason}" for reason, n in notices.items())
+        self.notify(
+            f"Removed {sum(notices.values())} stale connection(s) ({detail})",
+            severity="warning",
+        )
+
+    async def on_unmount(self) -> None:
+        self._save_peers()
+        if self._public_browser is not None:
+            await self._public_browser.async_cancel()
+        if self._zeroconf is not None:
+            await self._zeroconf.async_close()
 
     def on_worker_state_changed(self, event) -> None:
         """Handle worker completion to update UI."""
         if not event.worker.is_finished:
             return
-
-        worker_name = event.worker.name
         result = event.worker.result
+        if not result:
+            return
+        handler = self._worker_handlers.get(event.worker.name)
+        if handler is not None:
+            handler(result)
+
+    def _on_liveness_done(self, result: list[str]) -> None:
+        """Drop connected boxes after several failed probes in a row."""
+        stale_codes: set[str] = set()
+        for code in result:
+            fails = self._probe_failures.get(code, 0) + 1
+            if fails >= _LIVENESS_STRIKES:
+                stale_codes.add(code)
+            else:
+                self._probe_failures[code] = fails
+        if stale_codes:
+            self._drop_connected_boxes(stale_codes, "unreachable")
+
+    def _on_share_done(self, result: dict) -> None:
+        """Record a started share, or report why it failed."""
+        if result.get("success"):
+            box_id = result["box_id"]
+            self.pending_shares.discard(box_id)
+            self.active_shares[box_id] = (
+                result["zeroconf"],
+                result["info"],
+                result["code"],
+                result["is_public"],
+                result["stop_event"],
+                result.get("granted_user_ids", set()),
+            )
+            self._schedule_share_renewal(box_id, time.monotonic())
+            self._shares_changed()
+            self.refresh_boxes()
 
-        # Handle public box discovery completion
-        if worker_name == "_discover_public_boxes_worker":
-            new_discovered = result if result is not None else {}
-            # Check if active public box is no longer available
-            if (
-                self.active_remote_box
-                and self.active_remote_box.get("type") == "public"
-            ):
-                active_code = self.active_remote_box.get("code")
-                if active_code and active_code not in new_discovered:
-                    self.active_remote_box = None
-                    self.viewing_remote = False
-                    self.refresh_files()
-                    self.notify("Public box is no longer available", severity="warning")
-            
-            # Cross-reference: remove connected boxes whose IP now has a different/public share
-            # This handles the case where sharer stopped and reshared with a new code
-            discovered_ips = {info["ip"] for info in new_discovered.values()}
-            stale_connected = []
-            for code, info in self.connected_boxes.items():
-                if info["ip"] in discovered_ips:
-                    # Same IP is now advertising a (possibly different) public share
-                    # The old code-based connection is stale
-                    stale_connected.append(code)
-            if stale_connected:
-                for code in stale_connected:
-                    del self.connected_boxes[code]
-                # Check if active remote box was removed
-                if (
-                    self.active_remote_box
-                    and self.active_remote_box.get("type") == "remote"
-                    and self.active_remote_box.get("code") in stale_connected
-                ):
-                    self.active_remote_box = None
-                    self.viewing_remote = False
-                    self.refresh_files()
-                self.refresh_boxes()
-                self.notify(
-                    f"Removed {len(stale_connected)} stale connection(s) (reshared)",
-                    severity="warning",
+            # Show any share errors
+            if result.get("share_errors"):
+                for err in result["share_errors"]:
+                    self.notify(err, title="Share Warning", severity="warning")
+
+            if result["is_public"]:
+                self.notify("Box is now public on LAN", title="Shared")
+
+            # Show the share code modal (for both public and private)
+            self.push_screen(
+                ShareCodeModal(
+                    code=result["code"],
+                    box_name=result["box_name"],
+                    write_usernames=result.get("write_usernames", []),
+                    owner=result["username"],
+                    is_public=result["is_public"],
                 )
-            
-            self.discovered_public = new_discovered
-            self._refresh_public_boxes()
-
-        # Handle liveness check completion
-        elif worker_name == "_check_liveness_worker" and result:
-            stale_codes = result
-            if stale_codes:
-                # Check if active remote box is being removed
-                active_removed = (
-                    self.active_remote_box
-                    and self.active_remote_box.get("code") in stale_codes
+            )
+        else:
+            self.pending_shares.discard(result.get("box_id", ""))
+            self._shares_changed()
+            self.refresh_boxes()
+            self.notify(
+                f"Share failed: {result.get('error')}",
+                title="Error",
+                severity="error",
+            )
+
+    def _on_connect_done(self, result: dict) -> None:
+        """Remember a box joined by code, or report the lookup failure."""
+        if result.get("code") == self._connecting:
+            self._connecting = None
+        if result.get("success"):
+            code = result["code"]
+            # Store the connection
+            self.connected_boxes[code] = {
+                "code": code,
+                "ip": result["ip"],
+                "port": result["port"],
+                "name": f"Remote ({code})",
+            }
+            self._probe_failures.pop(code, None)
+            self._peers_dirty = True
+            now = time.monotonic()
+            self._remote_list_cache[(result["ip"], result["port"])] = (
+                now,
+                result["files"],
+            )
+            self._last_seen[code] = now
+            self._set_status(f"Connected to {code}")
+            self.refresh_boxes()
+            self.push_screen(
+                ConnectSuccessModal(
+                    code=code,
+                    ip=result["ip"],
+                    port=result["port"],
+                    files_preview=result["files_preview"],
                 )
-                for code in stale_codes:
-                    if code in self.connected_boxes:
-                        del self.connected_boxes[code]
-                self.refresh_boxes()
-                # Clear file view if active box was removed
-                if active_removed:
-                    self.active_remote_box = None
-                    self.viewing_remote = False
-                    self.refresh_files()
+            )
+        else:
+            error = result.get("error", "unknown")
+            if error == "not_found":
                 self.notify(
-                    f"Removed {len(stale_codes)} unreachable box(es)",
+                    f"No share found with code: {result['code']}",
+                    title="Not Found",
                     severity="warning",
                 )
-
-        # Handle share worker completion
-        elif worker_name == "share_worker" and result:
-            if result.get("success"):
-                box_id = result["box_id"]
-                self.pending_shares.discard(box_id)
-                self.active_shares[box_id] = (
-                    result["zeroconf"],
-                    result["info"],
-                    result["code"],
-                    result["is_public"],
-                    result["stop_event"],
-                    result.get("granted_user_ids", set()),
-                )
-                self.refresh_boxes()
-
-                # Show any share errors
-                if result.get("share_errors"):
-                    for err in result["share_errors"]:
-                        self.notify(err, title="Share Warning", severity="warning")
-
-                if result["is_public"]:
-                    self.notify("Box is now public on LAN", title="Shared")
-
-                # Show the share code modal (for both public and private)
-                self.push_screen(
-                    ShareCodeModal(
-                        code=result["code"],
-                        box_name=result["box_name"],
-                        write_usernames=result.get("write_usernames", []),
-                        owner=result["username"],
-                        is_public=result["is_public"],
-                    )
+            elif error == "no_ip":
+                self.notify(
+                    "Could not resolve address", title="Error", severity="error"
                 )
             else:
-                self.pending_shares.discard(result.get("box_id", ""))
-                self.refresh_boxes()
                 self.notify(
-                    f"Share failed: {result.get('error')}",
-                    title="Error",
-                    severity="error",
+                    f"Connection failed: {error}", title="Error", severity="error"
                 )
-
-        # Handle connect worker completion
-        elif worker_name == "connect_worker" and result:
-            if result.get("success"):
-                code = result["code"]
-                # Store the connection
-                self.connected_boxes[code] = {
-                    "code": code,
-                    "ip": result["ip"],
-                    "port": result["port"],
-                    "name": f"Remote ({code})",
-                }
-                self._set_status(f"Connected to {code}")
-                self.refresh_boxes()
+            self._set_status("Connection failed")
+
+    def _on_fetch_remote_files_done(self, result: dict) -> None:
+        """Report a finished remote listing."""
+        if result.get("success"):
+            # The worker already streamed the files into the table
+            self._set_status(f"Remote box: {result['count']} file(s)")
+            # Only show modal on first connect or when box info is requested
+            if result.get("show_modal"):
                 self.push_screen(
                     ConnectSuccessModal(
-                        code=code,
+                        code=result["code"],
                         ip=result["ip"],
                         port=result["port"],
                         files_preview=result["files_preview"],
                     )
                 )
-            else:
-                error = result.get("error", "unknown")
-                if error == "not_found":
-                    self.notify(
-                        f"No share found with code: {result['code']}",
-                        title="Not Found",
-                        severity="warning",
-                    )
-                elif error == "no_ip":
-                    self.notify(
-                        "Could not resolve address", title="Error", severity="error"
-                    )
-                else:
-                    self.notify(
-                        f"Connection failed: {error}", title="Error", severity="error"
-                    )
-                self._set_status("Connection failed")
-
-        # Handle fetch remote files worker completion
-        elif worker_name == "fetch_remote_files_worker" and result:
-            if result.get("success"):
-                # Parse and display files in the table
-                files_text = result.get("files_text", "")
-                parsed_files = self._parse_remote_files(files_text)
-                self._populate_remote_files(parsed_files)
-                # Only show modal on first connect or when box info is requested
-                if result.get("show_modal"):
-                    self.push_screen(
-                        ConnectSuccessModal(
-                            code=result["code"],
-                            ip=result["ip"],
-                            port=result["port"],
-                            files_preview=result["files_preview"],
-                        )
-                    )
-            else:
-                self._set_status(f"Failed to fetch files: {result.get('error')}")
+        else:
+            self._set_status(f"Failed to fetch files: {result.get('error')}")
 
-        # Handle remote download worker completion
-        elif worker_name == "remote_download_worker" and result:
-            if result.get("success"):
-                self._set_status(f"Saved {result['filename']} to {result['dest']}")
-            else:
-                self._set_status(f"Download failed: {result.get('error')}")
-
-        # Handle remote upload worker completion
-        elif worker_name == "remote_upload_worker" and result:
-            if result.get("success"):
-                self._set_status(f"Uploaded {result['path']}")
-                # Refresh the remote file list
-                if self.active_remote_box:
-                    self._show_remote_box_files(
-                        self.active_remote_box, show_modal=False
-                    )
-            else:
-                self._set_status(f"Upload failed: {result.get('error')}")
-
-        # Handle remote delete worker completion
-        elif worker_name == "remote_delete_worker" and result:
-            if result.get("success"):
-                self._set_status(f"Deleted {result['filename']}")
-                # Refresh the remote file list
-                if self.active_remote_box:
-                    self._show_remote_box_files(
-                        self.active_remote_box, show_modal=False
-                    )
-            else:
-                self._set_status(f"Delete failed: {result.get('error')}")
+    def _on_remote_download_done(self, result: dict) -> None:
+        """Report a finished remote download."""
+        if result.get("success"):
+            self._set_status(f"Saved {result['filename']} to {result['dest']}")
+        else:
+            self._set_status(f"Download failed: {result.get('error')}")
+
+    def _on_remote_upload_done(self, result: dict) -> None:
+        """Report a finished remote upload and relist the box."""
+        if result.get("success"):
+            self._set_status(f"Uploaded {result['path']}")
+            # Refresh the remote file list
+            self._reload_active_remote_box()
+        else:
+            self._set_status(f"Upload failed: {result.get('error')}")
+
+    def _on_remote_batch_upload_done(self, result: dict) -> None:
+        """Report a finished folder upload and relist the box."""
+        results = result["results"]
+        failed = [r for r in results if not r.get("success")]
+        if failed:
+            self._set_status(
+                f"Uploaded {len(results) - len(failed)}/{len(results)} file(s); "
+                f"first error: {failed[0].get('error')}"
+            )
+        else:
+            self._set_status(f"Uploaded {len(results)} file(s)")
+        if len(failed) < len(results):
+            self._reload_active_remote_box()
+
+    def _on_remote_delete_done(self, result: dict) -> None:
+        """Report a finished remote delete and relist the box."""
+        if result.get("success"):
+            self._set_status(f"Deleted {result['filename']}")
+            # Refresh the remote file list
+            self._reload_active_remote_box()
+        else:
+            self._set_status(f"Delete failed: {result.get('error')}")
+
+    def _reload_active_remote_box(self) -> None:
+        """Refetch the open remote box's listing after it changed."""
+        if self.active_remote_box:
+            self._remote_list_cache.pop(
+                (self.active_remote_box["ip"], self.active_remote_box["port"]),
+                None,
+            )
+            self._show_remote_box_files(self.active_remote_box, show_modal=False)
 
     def _refresh_public_boxes(self) -> None:
         """Update the public boxes list in the sidebar."""
         if self.public_boxes is None:
             return
-        self.public_boxes.clear()
-        for code, info in self.discovered_public.items():
-            display = f"{info['name']} @ {info['ip']}"
-            item = ListItem(Static(display))
-            item.data = {"type": "public", "code": code, **info}
-            self.public_boxes.append(item)
-        self.public_boxes.refresh()
+        self._sync_list(
+            self.public_boxes,
+            self._public_items,
+            [
+                (
+                    code,
+                    f"{info['name']} @ {info['ip']}",
+                    {"type": "public", "code": code, **info},
+                )
+                for code, info in self.discovered_public.items()
+            ],
+        )
+
+    def _load_peers(self) -> bool:
+        """Restore remote boxes connected in a previous session.
+
+        Restored boxes are one failed probe away from being dropped, so the
+        liveness check right after mount prunes the ones that are gone.
+        """
+        path = self.ctx.peers_path
+        if path is None:
+            return False
+        try:
+            with open(path) as f:
+                peers = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(peers, dict):
+            return False
+        restored = False
+        for code, info in peers.items():
+            if code in self.connected_boxes:
+                continue
+            try:
+                self.connected_boxes[code] = {
+                    "code": code,
+                    "ip": info["ip"],
+                    "port": int(info["port"]),
+                    "name": info.get("name") or f"Remote ({code})",
+                }
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._probe_failures[code] = _LIVENESS_STRIKES - 1
+            restored = True
+        return restored
+
+    def _save_peers(self) -> None:
+        """Write connected_boxes to ctx.peers_path if membership changed."""
+        path = self.ctx.peers_path
+        if not self._peers_dirty or path is None:
+            return
+        peers = {
+            code: {"ip": info["ip"], "port": info["port"], "name": info["name"]}
+            for code, info in self.connected_boxes.items()
+        }
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(peers, f)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        self._peers_dirty = False
 
     def _check_connected_box_liveness(self) -> None:
-        """Check if connected remote boxes are still reachable (non-blocking)."""
-        if not self.connected_boxes:
+        """Check if connected remote boxes are still reachable (non-blocking).
+
+        Boxes we talked to within the last ``_LIVENESS_IDLE`` seconds are
+        known to be alive and are skipped. Rounds are at least
+        ``_LIVENESS_DEBOUNCE`` seconds apart, so repeated refreshes neither
+        restart probes in flight nor pile up failure strikes.
+        """
+        now = time.monotonic()
+        if now - self._liveness_at < _LIVENESS_DEBOUNCE:
             return
+        idle = {
+            code: (info["ip"], info["port"])
+            for code, info in self.connected_boxes.items()
+            if now - self._last_seen.get(code, 0.0) > _LIVENESS_IDLE
+        }
+        if not idle:
+            return
+        self._liveness_at = now
         self.run_worker(
-            self._check_liveness_worker,
+            self._check_liveness_async(idle),
             name="_check_liveness_worker",
+            group="liveness",
             exclusive=True,
-            thread=True,
         )
 
-    def _check_liveness_worker(self) -> list[str]:
-        """Worker that checks liveness of connected boxes (runs in thread)."""
-        stale_codes: list[str] = []
-        for code, info in list(self.connected_boxes.items()):
-            try:
+    async def _check_liveness_async(self, targets: dict[str, tuple[str, int]]) -> list[str]:
+        """Probe the given boxes in parallel; return the unreachable codes.
+
+        At most ``_LIVENESS_MAX_PROBES`` sockets are open at a time.
+        """
+        from shadowbox.network.client import connect_and_request_async
+
+        limit = asyncio.Semaphore(_LIVENESS_MAX_PROBES)
+
+        async def probe(ip: str, port: int):
+            async with limit:
                 # Quick TCP connect check with short timeout
-                connect_and_request(info["ip"], info["port"], "PING", timeout=2)
-            except Exception:
+                return await connect_and_request_async(
+                    ip, port, "PING", timeout=_LIVENESS_PROBE_TIMEOUT
+                )
+
+        codes = list(targets)
+        results = await asyncio.gather(
+            *(probe(ip, port) for ip, port in targets.values()),
+            return_exceptions=True,
+        )
+        now = time.monotonic()
+        stale_codes: list[str] = []
+        for code, res in zip(codes, results):
+            if isinstance(res, Exception):
                 stale_codes.append(code)
+            else:
+                self._last_seen[code] = now
+                self._probe_failures.pop(code, None)
         return stale_codes
 
     def action_quit(self) -> None:
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 import getpass
@@ -23,6 +23,23 @@ class AppContext:
     user: UserDirectory
     active_box: Box | None
     first_run: bool = False
+    # Where the UI remembers connected remote boxes between runs (None: don't).
+    peers_path: Optional[Path] = None
+    # box_id -> box_name for the user's boxes, filled lazily by box_names().
+    _box_names_cache: Optional[dict[str, str]] = field(
+        default=None, init=False, repr=False
+    )
+
+    def box_names(self) -> dict[str, str]:
+        """Return box_id -> box_name for the user's boxes, listing them once."""
+        if self._box_names_cache is None:
+            boxes = self.fm.list_user_boxes(self.user.user_id)
+            self._box_names_cache = {box.box_id: box.box_name for box in boxes}
+        return self._box_names_cache
+
+    def invalidate_boxes(self) -> None:
+        """Drop cached box data after a box is created or deleted."""
+        self._box_names_cache = None
 
 
 def _user_from_row(fm: FileManager, row: dict) -> UserDirectory:
@@ -118,4 +135,11 @@ def build_context(
                 )
         active_box = default_box
 
-    return AppContext(db=db, fm=fm, user=user, active_box=active_box, first_run=first_run)
+    return AppContext(
+        db=db,
+        fm=fm,
+        user=user,
+        active_box=active_box,
+        first_run=first_run,
+        peers_path=db_path.with_name("peers.json"),
+    )
@@ -0,0 +1,146 @@
+"""In-memory fuzzy index for the TUI live search.
+
+Filenames and tags of every accessible file are kept in a bigram postings
+map. A query narrows the candidates with the postings lists and scores the
+survivors with a bit-parallel (bitap) matcher, so a keystroke costs a few
+dict lookups and bitwise ops instead of an FTS round-trip.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Generic, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Longest pattern handled in one machine word; longer tokens are truncated.
+_MAX_PATTERN = 64
+
+
+def _bigrams(text: str) -> set[str]:
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+def _max_errors(pattern: str) -> int:
+    # Short tokens must match exactly, longer ones tolerate typos.
+    if len(pattern) < 4:
+        return 0
+    if len(pattern) < 8:
+        return 1
+    return 2
+
+
+def bitap_distance(text: str, pattern: str, max_errors: int = 0) -> Optional[int]:
+    """Return the fewest edits with which ``pattern`` occurs inside ``text``.
+
+    Uses the Wu-Manber extension of bitap (shift-and) so insertions,
+    deletions and substitutions are all counted. Returns None when no
+    occurrence within ``max_errors`` edits exists.
+    """
+    pattern = pattern[:_MAX_PATTERN]
+    m = len(pattern)
+    if m == 0:
+        return 0
+
+    masks: dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+
+    full = (1 << m) - 1
+    match_bit = 1 << (m - 1)
+    # rows[d] holds the prefixes of pattern matched with at most d edits.
+    rows = [(1 << d) - 1 for d in range(max_errors + 1)]
+    best: Optional[int] = None
+
+    for ch in text:
+        mask = masks.get(ch, 0)
+        prev_old = rows[0]
+        prev_new = ((prev_old << 1) | 1) & mask
+        rows[0] = prev_new
+        if prev_new & match_bit:
+            return 0
+        for d in range(1, max_errors + 1):
+            old = rows[d]
+            new = (
+                (((old << 1) | 1) & mask)
+                | prev_old
+                | ((prev_old | prev_new) << 1)
+                | 1
+            ) & full
+            rows[d] = new
+            if new & match_bit and (best is None or d < best):
+                best = d
+            prev_old, prev_new = old, new
+    return best
+
+
+class FuzzyIndex(Generic[T]):
+    """Bigram postings over lowercased text, scored with bitap.
+
+    Each entry is a ``(text, payload)`` pair; :meth:`search` returns the
+    payloads of the best matches.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, T]]):
+        self._texts: list[str] = []
+        self._payloads: list[T] = []
+        self._postings: dict[str, list[int]] = {}
+        for text, payload in entries:
+            idx = len(self._texts)
+            text = text.lower()
+            self._texts.append(text)
+            self._payloads.append(payload)
+            for gram in _bigrams(text):
+                self._postings.setdefault(gram, []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _candidates(self, token: str, max_errors: int) -> Optional[set[int]]:
+        """Entries sharing enough bigrams with ``token`` to possibly match.
+
+        Every edit destroys at most two bigrams, so a match keeps at least
+        ``len(grams) - 2 * max_errors`` of them. Returns None when that bound
+        cannot prune anything (the caller then scans every entry).
+        """
+        grams = _bigrams(token)
+        threshold = len(grams) - 2 * max_errors
+        if threshold <= 0:
+            return None
+        counts: Counter[int] = Counter()
+        for gram in grams:
+            counts.update(self._postings.get(gram, ()))
+        return {idx for idx, n in counts.items() if n >= threshold}
+
+    def search(self, query: str, limit: int = 100) -> list[T]:
+        """Return payloads whose text matches every query token, best first."""
+        tokens = [t[:_MAX_PATTERN] for t in query.lower().split()]
+        if not tokens:
+            return []
+
+        candidates: Optional[set[int]] = None
+        for token in tokens:
+            found = self._candidates(token, _max_errors(token))
+            if found is None:
+                continue
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return []
+        pool: Iterable[int] = (
+            range(len(self._texts)) if candidates is None else candidates
+        )
+
+        scored: list[tuple[int, int, int]] = []
+        for idx in pool:
+            text = self._texts[idx]
+            total = 0
+            for token in tokens:
+                dist = bitap_distance(text, token, _max_errors(token))
+                if dist is None:
+                    break
+                total += dist
+            else:
+                scored.append((total, len(text), idx))
+
+        scored.sort()
+        return [self._payloads[idx] for _, _, idx in scored[:limit]]
@@ -1,5 +1,6 @@
 import getpass
 import io
+import json
 import uuid
 from pathlib import Path
 
@@ -157,18 +158,42 @@ def select_box(env, namespaced_box: str) -> dict:
     return target_box
 
 
-def format_list(env):
-    # newline list of filenames in default box (sort by latest)
+def _list_active_box(env):
     if not check_permission(env, env["box_id"], "read"):
         raise AccessDeniedError("You do not have read permission for this box.")
     fm = FileModel(env["db"])
-    items = fm.list_by_box(env["box_id"], include_deleted=False, limit=1000, offset=0)
+    return fm.list_by_box(env["box_id"], include_deleted=False, limit=1000, offset=0)
+
+
+def format_list(env):
+    # newline list of filenames in default box (sort by latest)
+    items = _list_active_box(env)
     return ",\n".join(
         f"{m.file_id}: {{Filename: {m.filename}, Size: {m.size}, Tags: {m.tags}, Status: {m.status}, Modified: {m.modified_at}}}"
         for m in items
     )
 
 
+def format_list_json(env):
+    # same listing as format_list, as a JSON array with one entry per line so
+    # clients can either parse it in one call or stream it line by line
+    items = _list_active_box(env)
+    entries = ",\n".join(
+        json.dumps(
+            {
+                "file_id": m.file_id,
+                "filename": m.filename,
+                "size": m.size,
+                "tags": list(m.tags),
+                "status": getattr(m.status, "value", m.status),
+                "modified_at": m.modified_at.isoformat() if m.modified_at else "",
+            }
+        )
+        for m in items
+    )
+    return f"[\n{entries}\n]" if entries else "[\n]"
+
+
 def open_for_get(env, identifier):
     """
     Return a readable file object for GET from active box.
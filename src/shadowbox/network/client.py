@@ -18,6 +18,7 @@ Usage:
 
 If no arguments given, defaults to LIST.
 """
+import asyncio
 import os
 import sys
 import socket
@@ -30,7 +31,8 @@ def set_code(code):
     SERVICE_TYPE = f"_shadowbox{code}._tcp.local."
 
 DISCOVER_TIMEOUT = 8.0  # seconds to wait for service discovery
-READ_BUF = 4096
+READ_BUF = 64 * 1024  # receive buffer for text replies (LIST, BOX, ...)
+FILE_CHUNK = 256 * 1024  # receive buffer for GET downloads
 
 
 class ServiceFinder:
@@ -113,6 +115,18 @@ class ServiceFinder:
             pass
 
 
+def _dial(ip, port, timeout):
+    """Open a TCP connection for one request, with Nagle's algorithm disabled.
+
+    Buffer sizes are left to the kernel: setting SO_RCVBUF/SO_SNDBUF after
+    connect() does not change the negotiated window scale and turns off
+    Linux's buffer auto-tuning.
+    """
+    s = socket.create_connection((ip, port), timeout=timeout)
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return s
+
+
 def connect_and_request(ip, port, request_line, recv_file=False, out_path=None, timeout=10):
     """
     Connect to ip:port, send a single request_line (ending with '\n'), and either:
@@ -120,7 +134,7 @@ def connect_and_request(ip, port, request_line, recv_file=False, out_path=None,
       - if recv_file==True: stream bytes to out_path until remote closes
     """
     print(f"Connecting to {ip}:{port} ...")
-    with socket.create_connection((ip, port), timeout=timeout) as s:
+    with _dial(ip, port, timeout) as s:
         s.settimeout(timeout)  # 10s might be too much
 
         # send request
@@ -132,19 +146,25 @@ def connect_and_request(ip, port, request_line, recv_file=False, out_path=None,
             if not out_path:
                 raise ValueError("out_path required when recv_file=True")
             print(f"Receiving file to {out_path} ...")
+            # one reusable buffer; recv_into avoids a new bytes object per chunk
+            buf = bytearray(FILE_CHUNK)
+            view = memoryview(buf)
+            first = True
             with open(out_path, "wb") as f: # this automatically creates a file, but it can't create a directory
                 while True:
                     try:
-                        chunk = s.recv(
-                            8192)  # we can lower to 1024 or READ_BUF (it's TCP so it doesn't matter that much)
-                        if not chunk:
+                        n = s.recv_into(view)
+                        if not n:
                             break
-                        if chunk.startswith(b"ERROR: File not found:"):
+                        # the server reports a missing file in place of the data
+                        if first and buf[:n].startswith(b"ERROR: File not found:"):
                             return {"status": "error", "error": f"File not found: {out_path}"}
-                        f.write(chunk)
+                        first = False
+                        f.write(view[:n])
                     except socket.timeout:
+                        # the data stopped arriving, so out_path is truncated
                         print("Socket timeout while receiving.")
-                        break
+                        return {"status": "error", "error": f"Timed out receiving {out_path}"}
             print("File receive complete.")
             return {"status": "ok", "saved_to": out_path}
         else:
@@ -158,14 +178,66 @@ def connect_and_request(ip, port, request_line, recv_file=False, out_path=None,
                     break
                 if not chunk:
                     break
-                try:
-                    parts.append(chunk.decode())  # utf-8
-                except Exception:
-                    parts.append(str(chunk))
-            data = "".join(parts)
+                parts.append(chunk)
+            # decode once so multi-byte characters split across reads stay intact
+            data = b"".join(parts).decode(errors="replace")  # utf-8
             return {"status": "ok", "text": data}
 
 
+async def connect_and_request_async(ip, port, request_line, timeout=10):
+    """
+    asyncio counterpart of connect_and_request for text responses.
+    Sends request_line and reads until the remote closes; a timeout ends the
+    response like in the blocking version.
+    """
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    try:
+        if not request_line.endswith("\n"):
+            request_line = request_line + "\n"
+        writer.write(request_line.encode())
+        await writer.drain()
+
+        parts = []
+        while True:
+            try:
+                chunk = await asyncio.wait_for(reader.read(READ_BUF), timeout)
+            except asyncio.TimeoutError:
+                break
+            if not chunk:
+                break
+            parts.append(chunk)
+        data = b"".join(parts).decode(errors="replace")
+        return {"status": "ok", "text": data}
+    finally:
+        writer.close()
+
+
+async def iter_lines_async(ip, port, request_line, timeout=10):
+    """
+    Like connect_and_request_async, but yields the response one line at a time
+    (decoded, without the newline) as it arrives instead of buffering it all.
+    """
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(ip, port, limit=1 << 24), timeout
+    )
+    try:
+        if not request_line.endswith("\n"):
+            request_line = request_line + "\n"
+        writer.write(request_line.encode())
+        await writer.drain()
+
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            yield line.decode(errors="replace").rstrip("\r\n")
+    finally:
+        writer.close()
+
+
 def get_server_address(code: str, timeout: float = DISCOVER_TIMEOUT):
     """
     Discover a server with a specific code suffix ("icmf" -> _shadowboxicmf._tcp.local.)
@@ -234,7 +306,7 @@ def cmd_put(ip, port, local_path, remote_name=None, timeout=60):
     size = os.path.getsize(local_path)
 
     print(f"Uploading {local_path} -> {ip}:{port} as {remote_name} ({size} bytes)")
-    with socket.create_connection((ip, port), timeout=timeout) as s:
+    with _dial(ip, port, timeout) as s:
         s.settimeout(timeout)
         s.sendall(f"PUT {remote_name} {size}\n".encode())
 
@@ -254,26 +326,23 @@ def cmd_put(ip, port, local_path, remote_name=None, timeout=60):
             print("Unexpected server response:", resp_text)
             return {"status": "error", "error": resp_text}
 
-        # send file bytes
+        # send file bytes; socket.sendfile uses os.sendfile (zero-copy) where available
+        # and falls back to a buffered send loop elsewhere (e.g. Windows)
         with open(local_path, "rb") as f:
-            while True:
-                chunk = f.read(8192)
-                if not chunk:
-                    break
-                s.sendall(chunk)
+            s.sendfile(f)
 
         # read final reply (text) until socket closes or timeout
-        final = b""
+        parts = []
         while True:
             try:
-                chunk = s.recv(1024)
+                chunk = s.recv(READ_BUF)
             except socket.timeout:
                 break
             if not chunk:
                 break
-            final += chunk
+            parts.append(chunk)
 
-        final_text = final.decode(errors="ignore").strip()
+        final_text = b"".join(parts).decode(errors="ignore").strip()
         print("Server reply:", final_text)
         return {"status": "ok", "reply": final_text}
 
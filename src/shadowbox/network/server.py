@@ -7,6 +7,10 @@ Protocol:
     LIST
     -> sends a formatted list of files available in the current box
 
+    LIST JSON
+    -> same listing as a JSON array of
+       {file_id, filename, size, tags, status, modified_at} objects
+
     GET <filename>
     -> streams that file's bytes from storage
 
@@ -41,6 +45,7 @@ from .adapter import (
     delete_filename,
     finalize_put,
     format_list,
+    format_list_json,
     init_env,
     list_available_users,
     list_boxes,
@@ -113,7 +118,7 @@ def handle_client(conn, addr, context):
         line = data.decode().strip()
         print(f"Received command: {line} from {addr}")
 
-        if line.upper() == "LIST":
+        if line.upper() in ("LIST", "LIST JSON"):
             if mode == "test":
                 root = shared_dir or "."
                 try:
@@ -129,7 +134,10 @@ def handle_client(conn, addr, context):
                     conn.sendall(payload.encode())
                     print(f"Sent test-mode file list from {root}")
             else:
-                response = format_list(env)
+                if line.upper() == "LIST JSON":
+                    response = format_list_json(env)
+                else:
+                    response = format_list(env)
                 conn.sendall(response.encode())
                 print("Sent file list")
 
@@ -281,6 +281,55 @@ def test_box_share_model_access_levels(db_conn):
     assert sm.get("s2") is None
 
 
+def test_user_model_ensure_usernames(db_conn):
+    """ensure_usernames should keep existing ids and create the missing users."""
+    um = UserModel(db_conn)
+    um.create("u1", "alice")
+
+    ids = um.ensure_usernames(["alice", "bob", "bob"])
+
+    assert ids["alice"] == "u1"
+    assert um.get_by_username("bob")["user_id"] == ids["bob"]
+    assert um.ensure_usernames(["bob"]) == {"bob": ids["bob"]}
+    assert um.ensure_usernames([]) == {}
+
+
+def test_box_share_model_replace_many(db_conn):
+    """replace_many should swap existing (box, user) shares for the new rows."""
+    _um, _bm, box = _create_user_and_box(db_conn)
+    UserModel(db_conn).create("guest", "guest")
+    UserModel(db_conn).create("other", "other")
+
+    sm = BoxShareModel(db_conn)
+    sm.create(
+        BoxShare(
+            share_id="old",
+            box_id=box.box_id,
+            shared_by_user_id="u1",
+            shared_with_user_id="guest",
+            permission_level="read",
+        )
+    )
+
+    sm.replace_many(
+        [
+            BoxShare(
+                share_id=f"new-{user}",
+                box_id=box.box_id,
+                shared_by_user_id="u1",
+                shared_with_user_id=user,
+                permission_level="write",
+            )
+            for user in ("guest", "other")
+        ]
+    )
+
+    assert sm.get("old") is None
+    rows = sm.list_by_box(box.box_id)
+    assert sorted(r["share_id"] for r in rows) == ["new-guest", "new-other"]
+    assert sm.has_access(box.box_id, "guest", "write") is True
+
+
 # --- FileModel and FileVersionModel tests ---
 
 
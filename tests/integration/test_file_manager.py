@@ -186,6 +186,35 @@ def test_list_box_files_enforces_access_control(file_manager: FileManager, tmp_p
         file_manager.list_box_files(box.box_id, user_id=outsider.user_id)
 
 
+def test_list_box_files_columns_matches_list_box_files(
+    file_manager: FileManager, tmp_path: Path
+) -> None:
+    """The column listing carries the same files, tags and order as list_box_files."""
+    owner = file_manager.create_user("erin")
+    box = file_manager.create_box(user_id=owner.user_id, box_name="docs")
+    for name, tags in (("a.txt", ["x", "y"]), ("b.txt", [])):
+        source_file = tmp_path / name
+        source_file.write_bytes(name.encode())
+        file_manager.add_file(
+            user_id=owner.user_id,
+            box_id=box.box_id,
+            source_path=str(source_file),
+            tags=tags,
+        )
+
+    files = file_manager.list_box_files(box.box_id)
+    cols = file_manager.list_box_files_columns(box.box_id)
+
+    assert cols["file_id"] == [f.file_id for f in files]
+    assert cols["filename"] == [f.filename for f in files]
+    assert cols["size"] == [f.size for f in files]
+    assert [sorted(t) for t in cols["tags"]] == [sorted(f.tags) for f in files]
+    assert cols["status"] == [f.status.value for f in files]
+
+    with pytest.raises(BoxNotFoundError):
+        file_manager.list_box_files_columns("missing")
+
+
 def test_setup_encryption_calls_backend(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Verify master key setup is invoked when encryption is enabled."""
     called: Dict[str, str] = {}
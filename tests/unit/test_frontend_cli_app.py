@@ -1,11 +1,32 @@
 """Unit tests for the ShadowBox Textual App (Frontend)."""
 
+import asyncio
+import time
+
 import pytest
 from unittest.mock import Mock, MagicMock
 from datetime import datetime
 
 # Import the app and context
-from shadowbox.frontend.cli.app import ShadowBoxApp, _human_size, InitialSetupModal, NewBoxModal
+from shadowbox.frontend.cli.app import (
+    ConnectModal,
+    ConnectResult,
+    ShadowBoxApp,
+    _fmt_modified,
+    _human_size,
+    InitialSetupModal,
+    LiveSearchScreen,
+    NewBoxModal,
+    ReplaceShareConfirmModal,
+    ShareBoxResult,
+    ShareCodeModal,
+    TagSearchModal,
+    _LIVENESS_DEBOUNCE,
+    _LIVENESS_STRIKES,
+    _FTS_DEBOUNCE,
+    _KeyDismissModal,
+    _USER_ROW_TTL,
+)
 from shadowbox.frontend.cli.context import AppContext
 from shadowbox.core.models import FileMetadata, FileStatus, Box, FileType
 from textual.widgets import Static
@@ -28,9 +49,25 @@ def mock_fm():
         "quota_bytes": 1000,
         "used_bytes": 100
     }
+    # The files table reads column lists; derive them from list_box_files.
+    fm.list_box_files_columns.side_effect = lambda box_id: _columns(
+        fm.list_box_files(box_id)
+    )
     return fm
 
 
+def _columns(files):
+    """Shape FileMetadata objects like FileManager.list_box_files_columns."""
+    return {
+        "file_id": [f.file_id for f in files],
+        "filename": [f.filename for f in files],
+        "size": [f.size for f in files],
+        "tags": [f.tags for f in files],
+        "status": [f.status.value for f in files],
+        "modified_at": [f.modified_at.isoformat() for f in files],
+    }
+
+
 @pytest.fixture
 def mock_user():
     """Create a mock UserDirectory."""
@@ -74,6 +111,18 @@ def test_human_size_formatting():
     assert _human_size(1024) == "1.0 KB"
     assert _human_size(1024 * 1024 * 2.5) == "2.5 MB"
     assert _human_size(1024 * 1024 * 1024) == "1.0 GB"
+    assert _human_size(1024 ** 5) == "1.0 PB"
+    assert _human_size(3 * 1024 ** 6) == "3072.0 PB"
+
+
+def test_modified_formatting():
+    """DB timestamps are shown to the second, like datetimes."""
+    stamp = datetime(2024, 5, 6, 7, 8, 9, 123456)
+    assert _fmt_modified(stamp) == "2024-05-06T07:08:09"
+    assert _fmt_modified(str(stamp)) == "2024-05-06T07:08:09"
+    assert _fmt_modified(stamp.replace(microsecond=0).isoformat()) == "2024-05-06T07:08:09"
+    assert _fmt_modified("2024-05-06T07:08:09+00:00") == "2024-05-06T07:08:09+00:00"
+    assert _fmt_modified("not a date") == "not a date"
 
 
 # --- Test 2: App Startup & Data Loading ---
@@ -119,6 +168,96 @@ async def test_app_startup_refresh(mock_context):
         assert app.row_keys[0] == "f1"
 
 
+@pytest.mark.asyncio
+async def test_delete_box_lists_boxes_once(mock_context):
+    """Deleting a box reuses the box list it fetched for the sidebar."""
+    box_a = Mock(box_id="b1", box_name="Box A", settings={}, user_id="user123")
+    box_b = Mock(box_id="b2", box_name="Box B", settings={}, user_id="user123")
+    mock_context.fm.list_user_boxes.return_value = [box_a, box_b]
+    mock_context.fm.list_shared_boxes.return_value = []
+    mock_context.fm.list_box_files.return_value = []
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        mock_context.active_box = box_a
+        mock_context.fm.list_user_boxes.return_value = [box_b]
+        mock_context.fm.list_user_boxes.reset_mock()
+        app._handle_delete_box(True)
+        await pilot.pause()
+
+        mock_context.fm.delete_box.assert_called_once_with("b1")
+        mock_context.fm.list_user_boxes.assert_called_once()
+        assert mock_context.active_box is box_b
+        assert [item.data for item in app.boxes.children] == [box_b]
+
+
+@pytest.mark.asyncio
+async def test_large_box_fills_table_in_pages(mock_context):
+    """Only a page of rows is materialized; the rest load on demand."""
+    mock_context.fm.list_user_boxes.return_value = []
+    mock_context.fm.list_shared_boxes.return_value = []
+    mock_context.fm.list_box_files.return_value = [
+        FileMetadata(
+            file_id=f"f{i}",
+            box_id="box1",
+            filename=f"file{i}.txt",
+            size=i,
+            status=FileStatus.ACTIVE,
+            modified_at=datetime(2023, 1, 1),
+            file_type=FileType.DOCUMENT,
+        )
+        for i in range(2000)
+    ]
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        table = app.query_one("#files")
+        assert len(app.row_keys) == 2000
+        assert app._row_index["f1999"] == 1999
+        first_page = table.row_count
+        assert 0 < first_page < 2000
+        assert "Files: 2000" in str(app.status.render())
+
+        # Moving the cursor to the end of the loaded rows pulls in more.
+        table.move_cursor(row=first_page - 1)
+        await pilot.pause()
+        assert table.row_count > first_page
+
+        # Jumping to a row loads everything up to it.
+        app._load_more_rows(upto=1500)
+        table.move_cursor(row=1500)
+        await pilot.pause()
+        assert table.row_count > 1500
+        assert app._selected_file_id() == "f1500"
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_fills_table(mock_context):
+    """refresh_files(background=True) loads the listing off the UI thread."""
+    mock_context.fm.list_user_boxes.return_value = []
+    mock_context.fm.list_shared_boxes.return_value = []
+    mock_context.fm.list_box_files.return_value = []
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        mock_context.fm.list_box_files.return_value = [
+            FileMetadata(
+                file_id="f1",
+                box_id="box1",
+                filename="late.txt",
+                size=1,
+                status=FileStatus.ACTIVE,
+                modified_at=datetime(2023, 1, 1),
+                file_type=FileType.DOCUMENT,
+            )
+        ]
+        app.refresh_files(background=True)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert app.row_keys == ["f1"]
+        assert app.query_one("#files").row_count == 1
+
+
 # --- Test 3: First Run Setup Logic ---
 
 @pytest.mark.asyncio
@@ -175,3 +314,672 @@ async def test_new_box_action(mock_context):
             description="A test box",
             enable_encryption=False
         )
+
+
+# --- Test 5: Remote Listing ---
+
+def test_list_remote_files_json_and_fallback(mock_context, monkeypatch):
+    """LIST JSON is parsed directly; an ERROR reply falls back to text LIST."""
+    app = ShadowBoxApp(ctx=mock_context)
+    json_reply = (
+        '[{"file_id": "f1", "filename": "a.txt", "size": 5, "tags": ["x"], '
+        '"status": "active", "modified_at": ""}]'
+    )
+    replies = {"LIST JSON": {"text": json_reply}}
+    sent = []
+
+    def fake_request(ip, port, line, timeout=10):
+        sent.append(line)
+        return replies[line]
+
+    monkeypatch.setattr(
+        "shadowbox.network.client.connect_and_request", fake_request
+    )
+
+    files = app._list_remote_files("127.0.0.1", 9999)
+    assert sent == ["LIST JSON"]
+    assert files[0]["filename"] == "a.txt"
+    assert files[0]["tags"] == ["x"]
+
+    sent.clear()
+    replies["LIST JSON"] = {"text": "ERROR - Unknown command\n"}
+    replies["LIST"] = {
+        "text": "f2: {Filename: b.txt, Size: 7, Tags: ['y'], Status: active, Modified: 2024-01-01}"
+    }
+    files = app._list_remote_files("127.0.0.1", 9999)
+    assert sent == ["LIST JSON", "LIST"]
+    assert files == [
+        {
+            "file_id": "f2",
+            "filename": "b.txt",
+            "size": 7,
+            "tags": ["y"],
+            "status": "active",
+            "modified_at": "2024-01-01",
+        }
+    ]
+
+
+def test_remote_listing_cache_skips_network(mock_context, monkeypatch):
+    """A fresh cached listing is shown without starting a fetch worker."""
+    app = ShadowBoxApp(ctx=mock_context)
+    files = [{"file_id": "f1", "filename": "a.txt", "size": 1, "tags": []}]
+    app._remote_list_cache[("10.0.0.5", 9000)] = (time.monotonic(), files)
+    shown = []
+    monkeypatch.setattr(app, "_populate_remote_files", shown.append)
+    monkeypatch.setattr(
+        app, "run_worker", lambda *a, **k: pytest.fail("unexpected fetch")
+    )
+
+    info = {"code": "abcd", "ip": "10.0.0.5", "port": 9000}
+    app._show_remote_box_files(info)
+    assert shown == [files]
+
+    app._remote_list_cache[("10.0.0.5", 9000)] = (time.monotonic() - 60, files)
+    started = []
+
+    def fake_run_worker(coro, **kwargs):
+        coro.close()
+        started.append(kwargs)
+
+    monkeypatch.setattr(app, "run_worker", fake_run_worker)
+    monkeypatch.setattr(app, "_set_status", lambda msg: None)
+    app._show_remote_box_files(info)
+    assert started and started[0]["name"] == "fetch_remote_files_worker"
+
+
+def test_box_permission_uses_cached_shares(mock_context):
+    """Share permissions are loaded once per box refresh, not per lookup."""
+    app = ShadowBoxApp(ctx=mock_context)
+    uid = mock_context.user.user_id
+    share_model = mock_context.fm.box_share_model
+    share_model.list_by_user.return_value = [
+        {"box_id": "b1", "shared_with_user_id": uid, "permission_level": "write"},
+        {"box_id": "b2", "shared_with_user_id": "other", "permission_level": "admin"},
+    ]
+    own = Mock(box_id="b0", user_id=uid)
+    shared = Mock(box_id="b1", user_id="other")
+    foreign = Mock(box_id="b2", user_id="other")
+
+    assert app._get_box_permission(own) == "owner"
+    assert app._get_box_permission(shared) == "write"
+    assert app._get_box_permission(foreign) == "read"
+    assert app._get_box_permission(shared) == "write"
+    share_model.list_by_user.assert_called_once_with(uid)
+
+
+def test_share_renewal_only_touches_due_shares(mock_context):
+    """Share TTLs are renewed from a heap of due times, not on every tick."""
+    app = ShadowBoxApp(ctx=mock_context)
+    app.active_shares = {
+        "b1": (None, None, "c1", False, None, {"u2"}),
+        "b2": (None, None, "c2", False, None, {"u3"}),
+    }
+    now = time.monotonic()
+    app._schedule_share_renewal("b1", now - 10)
+    app._schedule_share_renewal("b2", now)
+
+    cursor = mock_context.db.get_transaction_context.return_value.__enter__.return_value
+    app._extend_share_expiration()
+    assert cursor.executemany.call_count == 1
+    rows = cursor.executemany.call_args[0][1]
+    assert [row[1:] for row in rows] == [("b1", "u2")]
+
+    # b1 was rescheduled; nothing is due again yet.
+    cursor.executemany.reset_mock()
+    app._extend_share_expiration()
+    cursor.executemany.assert_not_called()
+
+    # Stopped shares drop out of the schedule.
+    del app.active_shares["b1"]
+    app._share_heap = [(now - 1, "b1")]
+    app._extend_share_expiration()
+    cursor.executemany.assert_not_called()
+    assert "b1" not in app._share_renew_at
+
+
+def test_share_renewal_batches_all_due_users(mock_context):
+    """Every due (box, user) pair is renewed with a single executemany."""
+    app = ShadowBoxApp(ctx=mock_context)
+    app.active_shares = {
+        "b1": (None, None, "c1", False, None, {"u2", "u3"}),
+        "b2": (None, None, "c2", False, None, {"u4"}),
+    }
+    now = time.monotonic()
+    app._schedule_share_renewal("b1", now - 10)
+    app._schedule_share_renewal("b2", now - 10)
+
+    cursor = mock_context.db.get_transaction_context.return_value.__enter__.return_value
+    app._extend_share_expiration()
+
+    assert cursor.executemany.call_count == 1
+    rows = cursor.executemany.call_args[0][1]
+    assert sorted(row[1:] for row in rows) == [("b1", "u2"), ("b1", "u3"), ("b2", "u4")]
+    assert len({row[0] for row in rows}) == 1
+    mock_context.db.execute.assert_not_called()
+
+
+def test_tag_search_returns_tags_from_one_query(mock_context, tmp_path):
+    """Accessible-by-tag search folds each file's tags into the main query."""
+    from shadowbox.database.connection import DatabaseConnection
+
+    db = DatabaseConnection(tmp_path / "tags.db")
+    db.initialize()
+    db.execute("INSERT INTO users (user_id, username) VALUES ('user123', 'tester')")
+    db.execute("INSERT INTO boxes (box_id, user_id, box_name) VALUES ('box1', 'user123', 'b')")
+    for file_id in ("f1", "f2"):
+        db.execute(
+            "INSERT INTO files (file_id, user_id, box_id, filename, original_path, size,"
+            " file_type, hash_sha256, owner, status)"
+            " VALUES (?, 'user123', 'box1', 'a.txt', '/a', 1, 'document', 'h',"
+            " 'user123', 'active')",
+            (file_id,),
+        )
+    for file_id, tag in (("f1", "work"), ("f1", "q 4"), ("f2", "work")):
+        db.execute(
+            "INSERT INTO tags (entity_type, entity_id, tag_name) VALUES ('file', ?, ?)",
+            (file_id, tag),
+        )
+    mock_context.db = db
+
+    app = ShadowBoxApp(ctx=mock_context)
+    hits = {f.file_id: sorted(f.tags) for f in app._search_accessible_by_tag("work")}
+
+    assert hits == {"f1": ["q 4", "work"], "f2": ["work"]}
+    assert app._search_accessible_by_tag("work", box_id="other") == []
+
+
+def test_remote_download_renames_part_file(mock_context, monkeypatch, tmp_path):
+    """Downloads land in a .part file and only replace the target on success."""
+    app = ShadowBoxApp(ctx=mock_context)
+    dest = tmp_path / "a.txt"
+    dest.write_bytes(b"keep me")
+    outcome = {"status": "error", "error": None}
+
+    def fake_request(ip, port, line, recv_file=False, out_path=None, timeout=10):
+        with open(out_path, "wb") as f:
+            f.write(b"partial")
+        outcome["error"] = f"File not found: {out_path}"
+        return dict(outcome)
+
+    monkeypatch.setattr("shadowbox.network.client.connect_and_request", fake_request)
+
+    result = app._remote_download_worker("127.0.0.1", 9999, "a.txt", str(dest))
+    assert result == {"success": False, "error": f"File not found: {dest}"}
+    assert dest.read_bytes() == b"keep me"
+    assert list(tmp_path.iterdir()) == [dest]
+
+    outcome["status"] = "ok"
+    result = app._remote_download_worker("127.0.0.1", 9999, "a.txt", str(dest))
+    assert result["success"] is True
+    assert dest.read_bytes() == b"partial"
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+def test_remote_download_timeout_keeps_destination(mock_context, monkeypatch, tmp_path):
+    """A transfer that stalls part-way never replaces the existing file."""
+    import socket
+
+    app = ShadowBoxApp(ctx=mock_context)
+    dest = tmp_path / "a.txt"
+    dest.write_bytes(b"keep me")
+    chunks = [b"partial"]
+
+    stalled = MagicMock()
+    stalled.__enter__.return_value = stalled
+
+    def recv_into(view):
+        if not chunks:
+            raise socket.timeout("timed out")
+        chunk = chunks.pop(0)
+        view[: len(chunk)] = chunk
+        return len(chunk)
+
+    stalled.recv_into.side_effect = recv_into
+    monkeypatch.setattr(
+        "shadowbox.network.client.socket.create_connection",
+        lambda address, timeout=None: stalled,
+    )
+
+    result = app._remote_download_worker("127.0.0.1", 9999, "a.txt", str(dest))
+    assert result["success"] is False
+    assert dest.read_bytes() == b"keep me"
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+@pytest.mark.asyncio
+async def test_replace_share_prompt_names_box_from_sidebar(mock_context):
+    """Sharing a second box names the shared one without reloading the box list."""
+    box_a = Mock(box_id="b1", box_name="Box A", user_id="user123", settings={})
+    box_b = Mock(box_id="b2", box_name="Box B", user_id="user123", settings={})
+    mock_context.fm.list_user_boxes.return_value = [box_a, box_b]
+    mock_context.fm.list_shared_boxes.return_value = []
+    mock_context.fm.list_box_files.return_value = []
+    mock_context.active_box = box_b
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        app.active_shares["b1"] = (MagicMock(), MagicMock(), "ABCD", False, None, set())
+        calls = mock_context.fm.list_user_boxes.call_count
+
+        app.action_share_box()
+        await pilot.pause()
+
+        assert isinstance(app.screen, ReplaceShareConfirmModal)
+        assert app.screen.current_box_name == "Box A"
+        assert app.screen.new_box_name == "Box B"
+        assert mock_context.fm.list_user_boxes.call_count == calls
+        app.active_shares.clear()
+
+
+def test_connected_boxes_persist_between_sessions(mock_context, tmp_path):
+    """Connected boxes are saved on change and restored one strike from eviction."""
+    mock_context.peers_path = tmp_path / "peers.json"
+    app = ShadowBoxApp(ctx=mock_context)
+    app.connected_boxes["abcd"] = {
+        "code": "abcd", "ip": "10.0.0.2", "port": 9999, "name": "Remote (abcd)"
+    }
+    app._save_peers()
+    assert not mock_context.peers_path.exists()  # nothing marked dirty yet
+
+    app._peers_dirty = True
+    app._save_peers()
+    assert app._peers_dirty is False
+
+    restored = ShadowBoxApp(ctx=mock_context)
+    assert restored._load_peers() is True
+    assert restored.connected_boxes == app.connected_boxes
+    assert restored._probe_failures["abcd"] == _LIVENESS_STRIKES - 1
+
+    mock_context.peers_path.write_text("not json")
+    assert ShadowBoxApp(ctx=mock_context)._load_peers() is False
+
+
+def test_liveness_drops_box_after_consecutive_failures(mock_context):
+    """One failed probe is tolerated; the box goes after _LIVENESS_STRIKES in a row."""
+    app = ShadowBoxApp(ctx=mock_context)
+    app.refresh_boxes = Mock()
+    app.notify = Mock()
+    app.set_timer = Mock()
+    app.connected_boxes["abcd"] = {
+        "code": "abcd", "ip": "10.0.0.2", "port": 9999, "name": "Remote (abcd)"
+    }
+
+    def probe_failed():
+        event = Mock()
+        event.worker.is_finished = True
+        event.worker.name = "_check_liveness_worker"
+        event.worker.result = ["abcd"]
+        app.on_worker_state_changed(event)
+
+    for _ in range(_LIVENESS_STRIKES - 1):
+        probe_failed()
+        assert "abcd" in app.connected_boxes
+    probe_failed()
+    assert "abcd" not in app.connected_boxes
+    assert app._peers_dirty is True
+    assert "abcd" not in app._probe_failures
+
+
+@pytest.mark.asyncio
+async def test_liveness_probes_are_bounded(mock_context, monkeypatch):
+    """No more than _LIVENESS_MAX_PROBES probes are in flight at once."""
+    app = ShadowBoxApp(ctx=mock_context)
+    monkeypatch.setattr("shadowbox.frontend.cli.app._LIVENESS_MAX_PROBES", 2)
+    in_flight = peak = 0
+
+    async def fake_request(ip, port, command, timeout=10):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        if ip.endswith(".3"):
+            raise OSError("unreachable")
+        return {"text": "ERROR - Unknown command"}
+
+    monkeypatch.setattr(
+        "shadowbox.network.client.connect_and_request_async", fake_request
+    )
+    targets = {f"c{i}": (f"10.0.0.{i}", 9999) for i in range(6)}
+    assert await app._check_liveness_async(targets) == ["c3"]
+    assert peak == 2
+    assert set(app._last_seen) == set(targets) - {"c3"}
+
+
+def test_dropped_connections_share_one_toast(mock_context):
+    """Drops reported close together are announced once, with a breakdown."""
+    app = ShadowBoxApp(ctx=mock_context)
+    app.refresh_boxes = Mock()
+    app.notify = Mock()
+    app.set_timer = Mock()
+    for code, ip in (("aaaa", "10.0.0.2"), ("bbbb", "10.0.0.3"), ("cccc", "10.0.0.4")):
+        app.connected_boxes[code] = {"code": code, "ip": ip, "port": 9999, "name": code}
+
+    app._drop_connected_boxes({"aaaa", "bbbb"}, "unreachable")
+    app._drop_connected_boxes({"cccc"}, "reshared")
+    app.set_timer.assert_called_once()
+    app.notify.assert_not_called()
+
+    app._flush_drop_notices()
+    app.notify.assert_called_once()
+    message = app.notify.call_args.args[0]
+    assert message.startswith("Removed 3 ")
+    assert "2 unreachable" in message and "1 reshared" in message
+    assert app._drop_notices == {}
+
+
+@pytest.mark.asyncio
+async def test_public_box_list_keeps_unchanged_rows(mock_context):
+    """Rediscovering the same public boxes leaves their sidebar rows in place."""
+    mock_context.fm.list_user_boxes.return_value = []
+    mock_context.fm.list_shared_boxes.return_value = []
+    mock_context.fm.list_box_files.return_value = []
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        alice = {"name": "alice", "ip": "10.0.0.2", "port": 9999}
+        app._apply_public_discovery({"svc-a": dict(alice)})
+        await pilot.pause()
+        first = app.public_boxes.children[0]
+
+        app._apply_public_discovery({"svc-a": dict(alice)})
+        app._apply_public_discovery(
+            {"svc-a": dict(alice), "svc-b": {"name": "bob", "ip": "10.0.0.3", "port": 9999}}
+        )
+        await pilot.pause()
+
+        assert app.public_boxes.children[0] is first
+        assert [c.data["code"] for c in app.public_boxes.children] == ["svc-a", "svc-b"]
+
+
+def test_liveness_probes_are_debounced(mock_context, monkeypatch):
+    """Back-to-back liveness checks start only one probe round."""
+    app = ShadowBoxApp(ctx=mock_context)
+    app.connected_boxes["abcd"] = {
+        "code": "abcd", "ip": "10.0.0.2", "port": 9999, "name": "Remote (abcd)"
+    }
+    started = []
+
+    def fake_run_worker(coro, **kwargs):
+        coro.close()
+        started.append(kwargs["name"])
+
+    monkeypatch.setattr(app, "run_worker", fake_run_worker)
+
+    app._check_connected_box_liveness()
+    app._check_connected_box_liveness()
+    assert started == ["_check_liveness_worker"]
+
+    app._liveness_at -= _LIVENESS_DEBOUNCE
+    app._check_connected_box_liveness()
+    assert len(started) == 2
+
+
+def test_live_search_debounces_fts_queries(mock_context):
+    """FTS-backed searches wait for typing to pause; index searches do not."""
+    screen = LiveSearchScreen(mock_context)
+    timer = Mock()
+    screen.set_timer = Mock(return_value=timer)
+    screen.run_worker = Mock()
+
+    def typed(value):
+        event = Mock()
+        event.value = value
+        screen.on_search_changed(event)
+
+    typed("rep")
+    typed("repo")
+    assert screen.set_timer.call_count == 2
+    assert screen.set_timer.call_args.args[0] == _FTS_DEBOUNCE
+    timer.stop.assert_called_once()
+    screen.run_worker.assert_not_called()
+
+    # Firing the timer runs only the last query.
+    screen.set_timer.call_args.args[1]()
+    screen.run_worker.assert_called_once()
+    assert screen._search_timer is None
+
+    screen._index = Mock()
+    typed("report")
+    assert screen.run_worker.call_count == 2
+    assert screen.set_timer.call_count == 2
+
+
+def test_repeated_connect_to_same_code_is_coalesced(mock_context):
+    """A second connect for a code already being looked up starts nothing."""
+    app = ShadowBoxApp(ctx=mock_context)
+    app.run_worker = Mock()
+    app._set_status = Mock()
+    app.notify = Mock()
+
+    app._handle_connect(ConnectResult(code="abcd"))
+    app._handle_connect(ConnectResult(code="abcd"))
+    app.run_worker.assert_called_once()
+    assert app.run_worker.call_args.kwargs["group"] == "connect"
+
+    app._on_connect_done({"success": False, "code": "abcd", "error": "not_found"})
+    app._handle_connect(ConnectResult(code="abcd"))
+    assert app.run_worker.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tag_filter_modal_is_reused(mock_context):
+    """The tag prompt is built once and opens empty every time."""
+    mock_context.fm.list_user_boxes.return_value = []
+    mock_context.fm.list_shared_boxes.return_value = []
+    mock_context.fm.list_box_files.return_value = []
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        app.action_filter_by_tag()
+        await pilot.pause()
+        first = app.screen
+        assert isinstance(first, TagSearchModal)
+        first.tag_input.value = "work"
+        await pilot.press("escape")
+        await pilot.pause()
+        assert app.screen is not first
+
+        app.action_filter_by_tag()
+        await pilot.pause()
+        assert app.screen is first
+        assert first.tag_input.value == ""
+        assert first.focused is first.tag_input
+
+
+@pytest.mark.asyncio
+async def test_connect_modal_keys(mock_context):
+    """Enter submits a valid code, Escape cancels with None."""
+    mock_context.fm.list_user_boxes.return_value = []
+    mock_context.fm.list_box_files.return_value = []
+    results = []
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        app.push_screen(ConnectModal(), results.append)
+        await pilot.pause()
+        await pilot.press("a", "b", "enter")
+        await pilot.pause()
+        # Too short: the modal stays open.
+        assert isinstance(app.screen, ConnectModal)
+        await pilot.press("C", "d", "enter")
+        await pilot.pause()
+        assert results[0].code == "abcd"
+
+        app.push_screen(ConnectModal(), results.append)
+        await pilot.pause()
+        await pilot.press("escape")
+        await pilot.pause()
+        assert results[1] is None
+
+
+def test_status_rereads_user_row_when_dirty_or_stale(mock_context):
+    """The quota row is cached between changes, but not indefinitely."""
+    app = ShadowBoxApp(ctx=mock_context)
+    get = mock_context.fm.user_model.get
+
+    app._update_status()
+    app._update_status()
+    assert get.call_count == 1
+    assert mock_context.user.used_bytes == 100
+
+    app._user_row_dirty = True
+    app._update_status()
+    assert get.call_count == 2
+
+    get.return_value = dict(get.return_value, used_bytes=700)
+    app._user_row_at -= _USER_ROW_TTL + 1
+    app._update_status()
+    assert get.call_count == 3
+    assert mock_context.user.used_bytes == 700
+
+
+@pytest.mark.asyncio
+async def test_share_code_modal_buttons(mock_context, monkeypatch):
+    """Copy copies once and stays open; Done closes the modal once."""
+    mock_context.fm.list_user_boxes.return_value = []
+    mock_context.fm.list_box_files.return_value = []
+    copied = []
+    monkeypatch.setattr(
+        "shadowbox.frontend.cli.clipboard.copy_to_clipboard", copied.append
+    )
+    results = []
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        base = app.screen
+        modal = ShareCodeModal("ABCD", "documents", [], "tester")
+        app.push_screen(modal, results.append)
+        await pilot.pause()
+
+        await pilot.click("#copy")
+        await pilot.pause()
+        assert copied == ["ABCD"]
+        assert app.screen is modal
+        assert results == []
+
+        await pilot.click("#done")
+        await pilot.pause()
+        assert results == [None]
+        assert app.screen is base
+        assert copied == ["ABCD"]
+
+
+@pytest.mark.asyncio
+async def test_selecting_active_box_reloads_listing(mock_context, mock_box):
+    """Enter on the current box restores its listing after a tag filter."""
+    mock_context.fm.list_user_boxes.return_value = [mock_box]
+    mock_context.fm.list_box_files.return_value = []
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        app.refresh_files = Mock()
+        event = Mock()
+        event.item.data = mock_box
+        event.list_view = app.boxes
+        app.on_list_view_selected(event)
+        app.refresh_files.assert_called_once_with(background=True)
+
+
+@pytest.mark.asyncio
+async def test_remote_listing_skips_malformed_json_lines(mock_context, monkeypatch):
+    """One bad LIST JSON line drops that entry, not the whole listing."""
+    lines = [
+        "[",
+        '{"file_id": "f1", "filename": "a.txt", "size": 1},',
+        '{"file_id": "f2", "filename": ',
+        '{"file_id": "f3", "filename": "c.txt", "size": 3}',
+        "]",
+    ]
+
+    async def fake_iter_lines(ip, port, request, timeout=10):
+        for line in lines:
+            yield line + "\n"
+
+    monkeypatch.setattr(
+        "shadowbox.network.client.iter_lines_async", fake_iter_lines
+    )
+    app = ShadowBoxApp(ctx=mock_context)
+    files = [
+        entry
+        async for batch in app._stream_remote_files("10.0.0.2", 9999)
+        for entry in batch
+    ]
+    assert [f["file_id"] for f in files] == ["f1", "f3"]
+
+
+def test_row_cache_only_holds_the_listed_box(mock_context):
+    """Switching boxes drops the previous box's cached rows."""
+    app = ShadowBoxApp(ctx=mock_context)
+    listings = {
+        "b1": [("f1", "a.txt"), ("f2", "b.txt")],
+        "b2": [("f3", "c.txt")],
+    }
+    mock_context.fm.list_box_files_columns.side_effect = lambda box_id: {
+        "file_id": [fid for fid, _ in listings[box_id]],
+        "filename": [name for _, name in listings[box_id]],
+        "size": [1] * len(listings[box_id]),
+        "tags": [[]] * len(listings[box_id]),
+        "status": ["active"] * len(listings[box_id]),
+        "modified_at": ["2024-01-01 00:00:00"] * len(listings[box_id]),
+    }
+
+    first = app._build_file_rows("b1")
+    assert set(app._row_cache) == {"f1", "f2"}
+    cells = app._row_cache["f1"][1]
+    # Reloading the same box reuses the formatted cells.
+    assert app._build_file_rows("b1")[0][1] is cells
+    assert first[0][1] is cells
+
+    app._build_file_rows("b2")
+    assert set(app._row_cache) == {"f3"}
+
+
+@pytest.mark.asyncio
+async def test_key_dismiss_modal_default_submit_closes(mock_context):
+    """A modal that does not override _submit closes with None on Enter."""
+    mock_context.fm.list_user_boxes.return_value = []
+    mock_context.fm.list_box_files.return_value = []
+    results = []
+
+    class Plain(_KeyDismissModal[None]):
+        pass
+
+    app = ShadowBoxApp(ctx=mock_context)
+    async with app.run_test() as pilot:
+        base = app.screen
+        app.push_screen(Plain(), results.append)
+        await pilot.pause()
+        await pilot.press("enter")
+        await pilot.pause()
+        assert results == [None]
+        assert app.screen is base
+
+
+def test_failed_share_withdraws_advertisement(mock_context, monkeypatch):
+    """If share setup fails after advertising, the mDNS service is removed."""
+    zeroconf, info = MagicMock(), MagicMock()
+    monkeypatch.setattr("shadowbox.network.server.give_code", lambda: "abcd")
+    monkeypatch.setattr(
+        "shadowbox.network.server.advertise_service",
+        lambda name, port, service_type: (zeroconf, info),
+    )
+    monkeypatch.setattr(
+        "shadowbox.network.adapter.init_env", lambda **kwargs: {"db": MagicMock()}
+    )
+    monkeypatch.setattr("shadowbox.network.adapter.select_box", lambda env, name: None)
+
+    def broken_model(db):
+        raise RuntimeError("db gone")
+
+    monkeypatch.setattr("shadowbox.frontend.cli.app.BoxShareModel", broken_model)
+
+    app = ShadowBoxApp(ctx=mock_context)
+    result = app._do_share_worker(
+        "box1", "documents", ShareBoxResult(is_public=False, write_usernames=[]), "tester"
+    )
+    assert result == {"success": False, "box_id": "box1", "error": "db gone"}
+    zeroconf.unregister_service.assert_called_once_with(info)
+    zeroconf.close.assert_called_once()
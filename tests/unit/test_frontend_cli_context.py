@@ -3,7 +3,7 @@
 import pytest
 from unittest.mock import Mock, patch
 from pathlib import Path
-from shadowbox.frontend.cli.context import build_context, _user_from_row
+from shadowbox.frontend.cli.context import AppContext, build_context, _user_from_row
 
 
 @pytest.fixture
@@ -33,6 +33,8 @@ def test_build_context_first_run(mock_deps, tmp_path):
     ctx = build_context(db_path=db_path, username="tester")
 
     assert ctx.first_run is True
+    # Remote box memory lives next to the database
+    assert ctx.peers_path == tmp_path / "peers.json"
     # In first run, active_box is None (user must create one)
     assert ctx.active_box is None
     # Check FTS was initialized
@@ -83,4 +85,30 @@ def test_user_from_row():
     assert user.username == "bob"
     assert user.quota_bytes == 1000
     assert user.used_bytes == 500
-    assert user.root_path == "/storage/u123"
\ No newline at end of file
+    assert user.root_path == "/storage/u123"
+
+
+def test_invalidate_boxes_clears_cache():
+    """Box name cache is not a constructor field and resets on invalidate."""
+    ctx = AppContext(db=Mock(), fm=Mock(), user=Mock(), active_box=None)
+    assert ctx._box_names_cache is None
+
+    ctx._box_names_cache = {"b1": "default"}
+    ctx.invalidate_boxes()
+
+    assert ctx._box_names_cache is None
+
+
+def test_box_names_lists_boxes_once():
+    """box_names caches the listing until the boxes are invalidated."""
+    fm = Mock()
+    fm.list_user_boxes.return_value = [Mock(box_id="b1", box_name="default")]
+    ctx = AppContext(db=Mock(), fm=fm, user=Mock(user_id="u1"), active_box=None)
+
+    assert ctx.box_names() == {"b1": "default"}
+    assert ctx.box_names() == {"b1": "default"}
+    fm.list_user_boxes.assert_called_once_with("u1")
+
+    ctx.invalidate_boxes()
+    ctx.box_names()
+    assert fm.list_user_boxes.call_count == 2
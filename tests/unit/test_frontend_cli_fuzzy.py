@@ -0,0 +1,39 @@
+"""Unit tests for the in-memory live search index."""
+
+from shadowbox.frontend.cli.fuzzy import FuzzyIndex, bitap_distance
+
+
+def test_bitap_distance_exact_and_fuzzy():
+    assert bitap_distance("quarterly_report.pdf", "report") == 0
+    # One substitution, one deletion, one insertion.
+    assert bitap_distance("quarterly_report.pdf", "rexort", 1) == 1
+    assert bitap_distance("quarterly_report.pdf", "reprt", 1) == 1
+    assert bitap_distance("quarterly_report.pdf", "repoort", 1) == 1
+    assert bitap_distance("quarterly_report.pdf", "rexort", 0) is None
+    assert bitap_distance("notes.txt", "report", 1) is None
+
+
+def test_index_ranks_and_filters():
+    idx = FuzzyIndex(
+        [
+            ("Report.pdf work", "a"),
+            ("quarterly_report_final.pdf", "b"),
+            ("holiday.jpg travel", "c"),
+        ]
+    )
+    assert len(idx) == 3
+    # Exact hits first, shorter text breaks ties.
+    assert idx.search("report") == ["a", "b"]
+    # Tags are indexed alongside the filename.
+    assert idx.search("travel") == ["c"]
+    # Every token has to match.
+    assert idx.search("report work") == ["a"]
+    # Typo tolerated on longer tokens.
+    assert idx.search("holidya") == ["c"]
+    assert idx.search("") == []
+    assert idx.search("zzz") == []
+
+
+def test_index_respects_limit():
+    idx = FuzzyIndex((f"file{i}.txt", i) for i in range(10))
+    assert len(idx.search("file", limit=3)) == 3
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import socket
 import sys
 from pathlib import Path
-from typing import Iterable, Literal, Optional, Tuple
+from typing import BinaryIO, Iterable, Literal, Optional, Tuple
 
 import pytest
 
@@ -22,12 +24,17 @@ class FakeSocket:
         self.recv_chunks: list[bytes] = list(recv_chunks)
         self.sent_data: bytes = b""
         self.timeout: Optional[float] = None
+        self.options: dict[tuple[int, int], int] = {}
         self.closed = False
 
     def settimeout(self, timeout: Optional[float]) -> None:
         """Record the requested timeout value for assertions."""
         self.timeout = timeout
 
+    def setsockopt(self, level: int, option: int, value: int) -> None:
+        """Record socket options set by the client."""
+        self.options[(level, option)] = value
+
     def sendall(self, data: bytes) -> None:
         """Accumulate outbound data to mimic socket transmission."""
         self.sent_data += data
@@ -38,6 +45,18 @@ class FakeSocket:
             return self.recv_chunks.pop(0)
         return b""
 
+    def recv_into(self, buffer: memoryview) -> int:
+        """Copy the next scripted chunk into ``buffer`` like ``socket.recv_into``."""
+        chunk = self.recv(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+    def sendfile(self, file: BinaryIO) -> int:
+        """Send the remaining contents of ``file`` like ``socket.sendfile``."""
+        data = file.read()
+        self.sent_data += data
+        return len(data)
+
     def close(self) -> None:
         """Mark the socket as closed."""
         self.closed = True
@@ -74,6 +93,23 @@ def test_connect_and_request_text_response(monkeypatch: pytest.MonkeyPatch) -> N
     assert result["text"] == "OK: response line\nfrom server"
 
 
+def test_connect_and_request_keeps_split_utf8(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A multi-byte character split across two reads decodes as one character."""
+    encoded = "café.txt\n".encode()
+    chunks = [encoded[:4], encoded[4:], b""]
+
+    def fake_create_connection(
+        address: Tuple[str, int], timeout: Optional[float] = None
+    ) -> FakeSocket:
+        return FakeSocket(chunks)
+
+    monkeypatch.setattr("shadowbox.network.client.socket.create_connection", fake_create_connection)
+
+    result = client.connect_and_request("127.0.0.1", 1234, "LIST")
+
+    assert result["text"] == "café.txt\n"
+
+
 def test_connect_and_request_receives_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     """Stream file bytes into a destination path when requested."""
     expected_chunks = [b"file bytes", b" more", b""]
@@ -149,6 +185,84 @@ def test_connect_and_request_missing_file_returns_error(
     assert out_path.read_bytes() == b""
 
 
+def test_connect_and_request_timeout_returns_error(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A transfer that stalls mid-file is reported as an error, not success."""
+
+    class StallingSocket(FakeSocket):
+        def recv(self, bufsize: int) -> bytes:
+            if self.recv_chunks:
+                return self.recv_chunks.pop(0)
+            raise socket.timeout("timed out")
+
+    fake_socket = StallingSocket([b"partial"])
+
+    def fake_create_connection(
+        address: Tuple[str, int], timeout: Optional[float] = None
+    ) -> FakeSocket:
+        return fake_socket
+
+    monkeypatch.setattr("shadowbox.network.client.socket.create_connection", fake_create_connection)
+
+    out_path = tmp_path / "stalled.bin"
+    result = client.connect_and_request(
+        "10.0.0.2",
+        8000,
+        "GET stalled.bin",
+        recv_file=True,
+        out_path=out_path,
+    )
+
+    assert result["status"] == "error"
+    assert str(out_path) in result["error"]
+
+
+def test_connect_and_request_async_reads_until_close() -> None:
+    """The asyncio client sends the request line and returns the full reply."""
+    received: list[bytes] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        received.append(await reader.readline())
+        writer.write(b"first line\n")
+        writer.write(b"second line")
+        await writer.drain()
+        writer.close()
+
+    async def run() -> dict:
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await client.connect_and_request_async("127.0.0.1", port, "LIST JSON")
+
+    result = asyncio.run(run())
+
+    assert result == {"status": "ok", "text": "first line\nsecond line"}
+    assert received == [b"LIST JSON\n"]
+
+
+def test_iter_lines_async_yields_each_line() -> None:
+    """The streaming client yields decoded lines as they arrive."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.readline()
+        writer.write(b"[\n{\"a\": 1},\r\n")
+        await writer.drain()
+        writer.write(b"]")
+        await writer.drain()
+        writer.close()
+
+    async def run() -> list:
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [
+                line async for line in client.iter_lines_async("127.0.0.1", port, "LIST JSON")
+            ]
+
+    assert asyncio.run(run()) == ["[", '{"a": 1},', "]"]
+
+
 def test_cmd_put_uploads_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     """Simulate a successful PUT upload handshake and final reply."""
     local_path = tmp_path / "local.txt"
@@ -168,6 +282,7 @@ def test_cmd_put_uploads_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -
     expected_prefix = f"PUT remote.txt {local_path.stat().st_size}\n".encode()
     assert fake_socket.sent_data.startswith(expected_prefix)
     assert fake_socket.sent_data.endswith(b"abc123")
+    assert fake_socket.options[(socket.IPPROTO_TCP, socket.TCP_NODELAY)] == 1
 
 
 def test_cmd_put_handles_server_error(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -1,9 +1,11 @@
 """Unit tests for the network adapter module."""
 
+import json
 import pytest
+from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 from shadowbox.network import adapter
-from shadowbox.core.models import FileType
+from shadowbox.core.models import FileStatus, FileType
 
 # --- Fixtures ---
 
@@ -110,6 +112,30 @@ def test_format_list_active_box(mock_env):
         assert "file2.jpg" in output
         assert "100" in output
 
+def test_format_list_json(mock_env):
+    """Test the JSON listing carries the same fields as the text one."""
+    with patch("shadowbox.network.adapter.check_permission", return_value=True), \
+         patch("shadowbox.network.adapter.FileModel") as MockFileModel:
+
+        f1 = Mock(file_id="f1", filename="file1.txt", size=100, tags=["a"],
+                  status=FileStatus.ACTIVE, modified_at=datetime(2024, 1, 2, 3, 4, 5))
+        MockFileModel.return_value.list_by_box.return_value = [f1]
+
+        text = adapter.format_list_json(mock_env)
+        output = json.loads(text)
+        # One entry per line so clients can stream it.
+        assert text.splitlines()[0] == "["
+        assert json.loads(text.splitlines()[1]) == output[0]
+
+        assert output == [{
+            "file_id": "f1",
+            "filename": "file1.txt",
+            "size": 100,
+            "tags": ["a"],
+            "status": "active",
+            "modified_at": "2024-01-02T03:04:05",
+        }]
+
 def test_format_list_no_box_selected(mock_env):
     """Test listing files when permission denied."""
     with patch("shadowbox.network.adapter.check_permission", return_value=False):
@@ -26,6 +26,7 @@ def mock_adapter():
             patch("shadowbox.network.server.finalize_put") as fin_put, \
             patch("shadowbox.network.server.delete_filename") as del_file, \
             patch("shadowbox.network.server.format_list") as fmt_list, \
+            patch("shadowbox.network.server.format_list_json") as fmt_list_json, \
             patch("shadowbox.network.server.list_boxes") as lst_boxes, \
             patch("shadowbox.network.server.share_box") as shr_box:
         yield {
@@ -34,6 +35,7 @@ def mock_adapter():
             "finalize_put": fin_put,
             "delete_filename": del_file,
             "format_list": fmt_list,
+            "format_list_json": fmt_list_json,
             "list_boxes": lst_boxes,
             "share_box": shr_box
         }
@@ -109,6 +111,19 @@ def test_handle_client_list_core_mode(mock_socket, mock_adapter):
     mock_socket.sendall.assert_called_with(b"file1\nfile2")
 
 
+def test_handle_client_list_json(mock_socket, mock_adapter):
+    """Test LIST JSON command returns the JSON listing."""
+    mock_socket.recv.side_effect = [b"LIST JSON\n", b""]
+    mock_adapter["format_list_json"].return_value = '[{"file_id": "f1"}]'
+
+    context = {"mode": "core", "env": {}}
+
+    server.handle_client(mock_socket, ("127.0.0.1", 1234), context)
+
+    mock_adapter["format_list"].assert_not_called()
+    mock_socket.sendall.assert_called_with(b'[{"file_id": "f1"}]')
+
+
 def test_handle_client_box_command(mock_socket, mock_adapter):
     """Test BOX command to switch active box."""
     mock_socket.recv.side_effect = [b"BOX mybox\n", b""]